@@ -0,0 +1,57 @@
+"""
+Векторизованный поиск первого нуля сразу во множестве строк.
+
+Строки упаковываются в двумерный массив NumPy фиксированной ширины,
+после чего индексы первых нулей находятся за один проход
+без вызова Python-функции на каждую строку.
+
+Возвращает массив `int64`: индекс первого нуля в каждой строке
+или -1, если строка не содержит нулей.
+"""
+
+from typing import Sequence, Union
+
+import numpy as np
+
+NO_ZERO = -1
+
+
+def as_char_matrix(ones_and_zeros: Union[Sequence[str], np.ndarray]):
+    """
+    Представляет набор строк в виде двумерной матрицы кодов символов.
+
+    Массивы фиксированной ширины ('S' и 'U') используются без копирования,
+    последовательности строк Python упаковываются в 'S' (один байт
+    на символ вместо четырех в 'U'). Строки с символами вне ASCII
+    упаковываются в 'U'.
+    """
+    if isinstance(ones_and_zeros, np.ndarray):
+        array = ones_and_zeros
+    else:
+        try:
+            array = np.asarray(ones_and_zeros, dtype='S')
+        except UnicodeEncodeError:
+            array = np.asarray(ones_and_zeros, dtype='U')
+    if array.dtype.kind not in 'SU':
+        array = array.astype('S')
+    if array.ndim != 1:
+        raise ValueError('Ожидается одномерный набор строк')
+    if array.dtype.kind == 'S':
+        code_type, width = np.uint8, array.dtype.itemsize
+    else:
+        code_type, width = np.uint32, array.dtype.itemsize // 4
+    array = np.ascontiguousarray(array)
+    return array.view(code_type).reshape(len(array), width)
+
+
+def find_first_zero_batch(
+    ones_and_zeros: Union[Sequence[str], np.ndarray]
+        ) -> np.ndarray:
+    """
+    Находит индексы первых нулей во всех строках за один проход.
+    """
+    chars = as_char_matrix(ones_and_zeros)
+    is_zero = chars == ord('0')
+    indexes = is_zero.argmax(axis=1).astype(np.int64)
+    indexes[~is_zero.any(axis=1)] = NO_ZERO
+    return indexes
@@ -0,0 +1,270 @@
+"""
+Замеры производительности функций поиска первого нуля.
+
+Для каждой длины входных данных (10 - 10^9), положения нуля
+(start, middle, end, none) и типа входных данных измеряются
+пропускная способность (символов в секунду) и пиковое потребление памяти.
+
+Входные данные имеют вид '1…10…0', чтобы их могли обрабатывать
+все функции, включая бинарный поиск. Для пакетного поиска строка
+делится на `BATCH_ROWS` строк одинаковой длины, а индекс
+`FirstZeroIndex` строится один раз до замера.
+
+Результаты выводятся таблицей и, при указании `--json`,
+сохраняются в машиночитаемом виде для сравнения между версиями.
+
+Пример запуска:
+    (.../find_first_zero$) python3 benchmark.py --max-power 7 --json out.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from batch_search import find_first_zero_batch
+from find_first_zero import (
+    find_first_zero_bisect,
+    find_first_zero_builtin,
+    find_first_zero_with_re
+)
+from mapped_search import find_first_zero_mapped
+from packed_search import find_first_zero_packed, pack_bits
+from parallel_search import find_first_zero_parallel
+from stream_search import find_first_zero_stream
+from zero_index import FirstZeroIndex
+
+BATCH_ROWS = 1000
+ZERO_POSITIONS = ('start', 'middle', 'end', 'none')
+
+
+class Engine(NamedTuple):
+    """
+    Реализация поиска: тип входных данных, подготовка входных данных
+    из строки и функция поиска.
+    """
+    name: str
+    input_type: str
+    prepare: Callable
+    search: Callable
+
+
+def write_temp_file(ones_and_zeros: str) -> str:
+    """ Сохраняет строку во временный файл и возвращает путь к нему. """
+    file = tempfile.NamedTemporaryFile('w', suffix='.log', delete=False)
+    with file:
+        file.write(ones_and_zeros)
+    return file.name
+
+
+def search_file_stream(path: str) -> int:
+    """ Потоковый поиск по файлу, открытому в двоичном режиме. """
+    with open(path, 'rb') as file:
+        return find_first_zero_stream(file)
+
+
+def split_rows(ones_and_zeros: str) -> np.ndarray:
+    """
+    Делит строку на `BATCH_ROWS` строк одинаковой длины
+    (массив 'S' без копирования), чтобы общее количество символов
+    в пакете совпадало с длиной входных данных.
+    """
+    data = ones_and_zeros.encode()
+    rows = min(BATCH_ROWS, len(data))
+    row_length = len(data) // rows
+    return np.frombuffer(data[:rows * row_length], dtype=f'S{row_length}')
+
+
+ENGINES = (
+    Engine('find_first_zero_builtin', 'str', str, find_first_zero_builtin),
+    Engine('find_first_zero_with_re', 'str', str, find_first_zero_with_re),
+    Engine(
+        'find_first_zero_bisect',
+        'str',
+        str,
+        lambda ones_and_zeros: find_first_zero_bisect(ones_and_zeros, None)
+    ),
+    Engine(
+        'find_first_zero_bisect (sample check)',
+        'str',
+        str,
+        find_first_zero_bisect
+    ),
+    Engine('find_first_zero_mapped', 'bytes', str.encode,
+           find_first_zero_mapped),
+    Engine('find_first_zero_mapped', 'file', write_temp_file,
+           find_first_zero_mapped),
+    Engine('find_first_zero_parallel', 'file', write_temp_file,
+           find_first_zero_parallel),
+    Engine(
+        'find_first_zero_stream',
+        'file',
+        write_temp_file,
+        search_file_stream
+    ),
+    Engine(
+        'find_first_zero_packed',
+        'packed bytes',
+        lambda ones_and_zeros: (
+            pack_bits(ones_and_zeros), len(ones_and_zeros)
+        ),
+        lambda packed: find_first_zero_packed(*packed)
+    ),
+    Engine(
+        'find_first_zero_batch',
+        'rows',
+        split_rows,
+        find_first_zero_batch
+    ),
+    Engine(
+        'FirstZeroIndex.find_first_zero',
+        'index',
+        FirstZeroIndex.from_string,
+        FirstZeroIndex.find_first_zero
+    ),
+)
+
+
+def make_input(length: int, zero_position: str) -> str:
+    """ Строка вида '1…10…0' с первым нулем в заданном положении. """
+    zero_index = {
+        'start': 0,
+        'middle': length // 2,
+        'end': length - 1,
+        'none': length,
+    }[zero_position]
+    return '1' * zero_index + '0' * (length - zero_index)
+
+
+def measure(
+    engine: Engine,
+    prepared,
+    number: Optional[int] = None
+        ) -> Dict[str, float]:
+    """
+    Время одного вызова и пиковая память Python-аллокаций.
+    Если `number` не указан, количество вызовов подбирается автоматически.
+    """
+    timer = timeit.Timer(lambda: engine.search(prepared))
+    if number is None:
+        number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=3, number=number)) / number
+
+    tracemalloc.start()
+    engine.search(prepared)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': seconds, 'peak_memory_bytes': peak_memory}
+
+
+def run_benchmark(
+    powers: range,
+    engines=ENGINES,
+    zero_positions=ZERO_POSITIONS,
+    number: Optional[int] = None
+        ) -> List[Dict]:
+    """ Выполняет замеры для всех сочетаний параметров. """
+    results = []
+    for power in powers:
+        length = 10 ** power
+        for zero_position in zero_positions:
+            ones_and_zeros = make_input(length, zero_position)
+            for engine in engines:
+                prepared = engine.prepare(ones_and_zeros)
+                try:
+                    measurement = measure(engine, prepared, number)
+                finally:
+                    if engine.prepare is write_temp_file:
+                        os.remove(prepared)
+                results.append({
+                    'engine': engine.name,
+                    'input_type': engine.input_type,
+                    'length': length,
+                    'zero_position': zero_position,
+                    'throughput': length / measurement['seconds'],
+                    **measurement,
+                })
+            del ones_and_zeros
+    return results
+
+
+def format_table(results: List[Dict]) -> str:
+    """ Форматирует результаты в текстовую таблицу. """
+    header = (
+        f'{"функция":<38} {"вход":<13} {"длина":>6} {"ноль":<7} '
+        f'{"симв./с":>10} {"память, Б":>10}'
+    )
+    rows = [header, '-' * len(header)]
+    for result in results:
+        rows.append(
+            f'{result["engine"]:<38} {result["input_type"]:<13} '
+            f'10^{len(str(result["length"])) - 1:<3} '
+            f'{result["zero_position"]:<7} '
+            f'{result["throughput"]:>10.2e} '
+            f'{result["peak_memory_bytes"]:>10}'
+        )
+    return '\n'.join(rows)
+
+
+def environment() -> Dict[str, str]:
+    """ Сведения об окружении для сравнения результатов между запусками. """
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--min-power', type=int, default=1,
+        help='минимальная длина входных данных, степень десяти'
+    )
+    parser.add_argument(
+        '--max-power', type=int, default=7,
+        help='максимальная длина входных данных, степень десяти (до 9)'
+    )
+    parser.add_argument(
+        '--engine', action='append',
+        help='ограничить замеры указанными функциями'
+    )
+    parser.add_argument(
+        '--number', type=int,
+        help='количество вызовов в замере (по умолчанию подбирается)'
+    )
+    parser.add_argument('--json', help='путь к файлу для сохранения JSON')
+    args = parser.parse_args(argv)
+
+    engines = [
+        engine for engine in ENGINES
+        if not args.engine or engine.name in args.engine
+    ]
+    results = run_benchmark(
+        range(args.min_power, args.max_power + 1),
+        engines,
+        number=args.number
+    )
+    print(format_table(results))
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(
+                {'environment': environment(), 'results': results},
+                file,
+                ensure_ascii=False,
+                indent=2
+            )
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -6,6 +6,9 @@
 """
 
 import re
+from typing import Optional, Sequence
+
+MONOTONIC_CHECK_SAMPLES = 64
 
 
 def find_first_zero_builtin(ones_and_zeros: str) -> int:
@@ -26,3 +29,88 @@ def find_first_zero_with_re(ones_and_zeros: str) -> int:
         index = contains_zeros.end() - 1
         return f'Индекс первого нуля: {index}.'
     return 'Строка не содержит нулей.'
+
+
+class NotMonotonicStringException(ValueError):
+    """
+    Исключение, вызываемое, если строка
+    не имеет вида '1…10…0'.
+    """
+    def __init__(self, index: int) -> None:
+        self.message = (
+            'Строка не имеет вида "1…10…0" '
+            f'(нарушение порядка у индекса {index})'
+        )
+        super().__init__(self.message)
+
+
+def bisect_zero_index(ones_and_zeros: Sequence[str]) -> int:
+    """
+    Бинарный поиск границы между блоком единиц и блоком нулей.
+    Выполняет не более ceil(log2(n + 1)) обращений к символам.
+
+    Возвращает длину строки, если нулей нет.
+    """
+    low, high = 0, len(ones_and_zeros)
+    while low < high:
+        middle = (low + high) // 2
+        if ones_and_zeros[middle] == '0':
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def check_monotonic_sample(
+    ones_and_zeros: Sequence[str],
+    index: int,
+    samples: int = MONOTONIC_CHECK_SAMPLES
+        ) -> None:
+    """
+    Выборочная проверка вида '1…10…0': символы в `samples`
+    равноотстоящих позициях сравниваются с ожидаемыми.
+    """
+    length = len(ones_and_zeros)
+    step = max(length // samples, 1)
+    for position in range(0, length, step):
+        expected = '1' if position < index else '0'
+        if ones_and_zeros[position] != expected:
+            raise NotMonotonicStringException(position)
+
+
+def check_monotonic_full(ones_and_zeros: str, index: int) -> None:
+    """
+    Полная проверка вида '1…10…0' за O(n) без копирования строки.
+    """
+    length = len(ones_and_zeros)
+    if (
+        ones_and_zeros.count('1', 0, index) != index
+        or ones_and_zeros.count('0', index) != length - index
+    ):
+        raise NotMonotonicStringException(index)
+
+
+def find_first_zero_bisect(
+    ones_and_zeros: str,
+    check: Optional[str] = 'sample'
+        ) -> str:
+    """
+    Находит индекс первого нуля в строке вида '1…10…0'
+    за O(log n) обращений к символам.
+
+    Параметр `check` задает проверку вида строки:
+      - 'sample' - выборочная проверка (по умолчанию);
+      - 'full' - полная проверка за O(n);
+      - None - без проверки.
+    При нарушении вида строки вызывается NotMonotonicStringException.
+    """
+    index = bisect_zero_index(ones_and_zeros)
+    if check == 'sample':
+        check_monotonic_sample(ones_and_zeros, index)
+    elif check == 'full':
+        check_monotonic_full(ones_and_zeros, index)
+    elif check is not None:
+        raise ValueError(f'Неизвестный режим проверки: {check!r}')
+    if index < len(ones_and_zeros):
+        return f'Индекс первого нуля: {index}.'
+    return 'Строка не содержит нулей.'
@@ -0,0 +1,65 @@
+"""
+Поиск первого нуля в файлах и двоичных буферах
+без копирования и декодирования данных.
+
+Принимает:
+ - путь к файлу (файл отображается в память через `mmap`);
+ - объект `mmap`;
+ - любой объект, поддерживающий buffer protocol
+   (`bytes`, `bytearray`, `memoryview` и т.д.).
+
+Возвращает смещение первого байта b'0' или -1, если нулей нет.
+Потребление памяти не зависит от размера файла:
+страницы файла подгружаются операционной системой по мере чтения.
+"""
+
+import mmap
+import os
+import re
+from typing import Union
+
+ZERO_BYTE = b'0'
+ZERO_BYTE_PATTERN = re.compile(re.escape(ZERO_BYTE))
+
+Source = Union[str, bytes, os.PathLike, bytearray, memoryview, mmap.mmap]
+
+
+def find_first_zero_in_buffer(buffer) -> int:
+    """
+    Находит смещение первого байта b'0' в буфере.
+
+    У `bytes`, `bytearray` и `mmap` используется встроенный метод `find`,
+    остальные объекты просматриваются через `memoryview`
+    регулярным выражением, которое работает с буфером напрямую.
+    """
+    if isinstance(buffer, (bytes, bytearray, mmap.mmap)):
+        return buffer.find(ZERO_BYTE)
+    with memoryview(buffer) as view:
+        if not view.c_contiguous:
+            raise ValueError('Буфер должен быть непрерывным (C-contiguous)')
+        with view.cast('B') as flat_view:
+            if contains_zeros := ZERO_BYTE_PATTERN.search(flat_view):
+                return contains_zeros.start()
+    return -1
+
+
+def find_first_zero_in_file(path: Union[str, os.PathLike]) -> int:
+    """
+    Отображает файл в память только для чтения
+    и находит смещение первого байта b'0'.
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return -1
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped.find(ZERO_BYTE)
+
+
+def find_first_zero_mapped(source: Source) -> int:
+    """
+    Единая точка входа: путь к файлу, `mmap` или буфер.
+    Строки и `os.PathLike` считаются путями к файлам.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return find_first_zero_in_file(source)
+    return find_first_zero_in_buffer(source)
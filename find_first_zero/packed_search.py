@@ -0,0 +1,93 @@
+"""
+Поиск первого нулевого бита в битово-упакованных данных.
+
+Один флаг занимает один бит вместо одного символа строки.
+Бит с индексом i хранится в байте i // 8 на позиции i % 8
+(начиная с младшего бита), что совпадает с порядком битов
+`int.from_bytes(data, 'little')` и `array('Q')` на little-endian машинах.
+
+Поддерживаемые входные данные:
+ - `bytes`, `bytearray`, `array('Q')` и другие буферы;
+ - целое число Python (бит i - это `(value >> i) & 1`).
+
+Для перехода со строкового формата '0'/'1' предусмотрены
+функции `pack_bits` и `unpack_bits`.
+"""
+
+import re
+from typing import Union
+
+NOT_ALL_ONES_BYTE_PATTERN = re.compile(rb'[^\xff]')
+WORD_SIZE = 8
+
+Packed = Union[int, bytes, bytearray, memoryview]
+
+
+def lowest_zero_bit(word: int) -> int:
+    """
+    Индекс младшего нулевого бита слова.
+    `~word & (word + 1)` оставляет только этот бит.
+    """
+    return (~word & (word + 1)).bit_length() - 1
+
+
+def find_first_zero_packed(packed: Packed, bit_length: int) -> int:
+    """
+    Находит индекс первого нулевого бита среди первых `bit_length` бит.
+    Возвращает -1, если все биты равны единице.
+
+    В буферах 64-битные слова из одних единиц пропускаются
+    поиском первого байта, отличного от 0xFF, после чего
+    нулевой бит находится внутри слова битовой операцией.
+    """
+    if bit_length < 0:
+        raise ValueError('Длина в битах не может быть отрицательной')
+    if isinstance(packed, int):
+        if packed < 0:
+            raise ValueError('Упакованное число не может быть отрицательным')
+        index = lowest_zero_bit(packed)
+        return index if index < bit_length else -1
+
+    with memoryview(packed) as view, view.cast('B') as bytes_view:
+        if bit_length > len(bytes_view) * 8:
+            raise ValueError(
+                f'Буфер содержит меньше {bit_length} бит'
+            )
+        byte_length = (bit_length + 7) // 8
+        not_all_ones = NOT_ALL_ONES_BYTE_PATTERN.search(
+            bytes_view, 0, byte_length
+        )
+        if not not_all_ones:
+            return -1
+        word_start = not_all_ones.start() // WORD_SIZE * WORD_SIZE
+        word = int.from_bytes(
+            bytes_view[word_start:word_start + WORD_SIZE], 'little'
+        )
+    index = word_start * 8 + lowest_zero_bit(word)
+    return index if index < bit_length else -1
+
+
+def pack_bits(ones_and_zeros: str) -> bytes:
+    """
+    Упаковывает строку из '0' и '1' в байты
+    (символ с индексом i становится битом i).
+    """
+    if not ones_and_zeros:
+        return b''
+    value = int(ones_and_zeros[::-1], 2)
+    return value.to_bytes((len(ones_and_zeros) + 7) // 8, 'little')
+
+
+def unpack_bits(packed: Packed, bit_length: int) -> str:
+    """
+    Распаковывает первые `bit_length` бит в строку из '0' и '1'.
+    """
+    if bit_length <= 0:
+        return ''
+    if not isinstance(packed, int):
+        with memoryview(packed) as view, view.cast('B') as bytes_view:
+            packed = int.from_bytes(
+                bytes_view[:(bit_length + 7) // 8], 'little'
+            )
+    packed &= (1 << bit_length) - 1
+    return format(packed, f'0{bit_length}b')[::-1]
@@ -0,0 +1,91 @@
+"""
+Многопроцессный поиск первого нуля в очень больших файлах.
+
+Файл делится на сегменты, каждый из которых просматривается
+в отдельном процессе через собственное отображение файла в память,
+поэтому данные между процессами не копируются.
+
+Как только в каком-либо сегменте найден ноль, еще не начатые
+сегменты правее него отменяются, а результат возвращается
+без ожидания уже начатых сегментов правее. Результат - наименьшее
+найденное смещение байта b'0' или -1.
+
+Файлы меньше порога `threshold`, а также буферы в памяти процесса,
+просматриваются в одном процессе: запуск пула для них дороже,
+чем последовательный поиск.
+"""
+
+import mmap
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Optional, Union
+
+from mapped_search import (
+    ZERO_BYTE,
+    find_first_zero_in_buffer,
+    find_first_zero_in_file
+)
+
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+DEFAULT_THRESHOLD = 256 * 1024 * 1024
+
+
+def scan_file_segment(path: Union[str, os.PathLike], start: int, end: int):
+    """ Ищет b'0' в сегменте [start, end) файла. """
+    with open(path, 'rb') as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        return mapped.find(ZERO_BYTE, start, end)
+
+
+def find_first_zero_parallel(
+    source,
+    workers: Optional[int] = None,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+    threshold: int = DEFAULT_THRESHOLD
+        ) -> int:
+    """
+    Находит смещение первого байта b'0' в файле на пуле процессов.
+
+    `source` - путь к файлу. Буферы в памяти (`bytes`, `mmap` и т.д.)
+    и файлы размером меньше `threshold` обрабатываются в текущем процессе.
+    """
+    if segment_size <= 0:
+        raise ValueError('Размер сегмента должен быть положительным')
+    if not isinstance(source, (str, os.PathLike)):
+        return find_first_zero_in_buffer(source)
+    size = os.path.getsize(source)
+    if size < threshold or size <= segment_size:
+        return find_first_zero_in_file(source)
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        segments = {
+            executor.submit(
+                scan_file_segment, source, start, start + segment_size
+            ): start
+            for start in range(0, size, segment_size)
+        }
+        pending = set(segments)
+        first_zero = -1
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                index = future.result()
+                if index >= 0 and (first_zero < 0 or index < first_zero):
+                    first_zero = index
+            if first_zero >= 0:
+                for future in pending:
+                    if segments[future] > first_zero:
+                        future.cancel()
+                pending = {
+                    future for future in pending
+                    if segments[future] < first_zero
+                }
+    finally:
+        #  Не ждем сегменты правее найденного нуля: еще не начатые
+        #  отменяются, начатые завершатся в фоне.
+        executor.shutdown(wait=False, cancel_futures=True)
+    return first_zero
@@ -0,0 +1,77 @@
+"""
+Потоковый поиск первого нуля в данных, поступающих частями:
+из итерируемых объектов, файлов, каналов и сокетов.
+
+Данные читаются блоками ограниченного размера, общее смещение
+отслеживается между блоками, а чтение прекращается
+сразу после нахождения первого нуля.
+
+Части могут быть строками (ищется '0') или байтами (ищется b'0').
+Возвращается смещение в символах или байтах соответственно, либо -1.
+"""
+
+from typing import AsyncIterable, Iterable, Iterator, Union
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+Chunk = Union[str, bytes, bytearray]
+
+
+def find_zero_in_chunk(chunk: Chunk) -> int:
+    """ Ищет '0' в строке или b'0' в байтах. """
+    return chunk.find('0' if isinstance(chunk, str) else b'0')
+
+
+def iter_blocks(file, block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[Chunk]:
+    """ Читает файловый объект блоками до конца данных. """
+    while block := file.read(block_size):
+        yield block
+
+
+def find_first_zero_stream(
+    source: Union[Iterable[Chunk], object],
+    block_size: int = DEFAULT_BLOCK_SIZE
+        ) -> int:
+    """
+    Находит смещение первого нуля в потоке частей.
+
+    `source` - итерируемый объект частей или файловый объект
+    с методом `read`, который читается блоками по `block_size`.
+    """
+    if block_size <= 0:
+        raise ValueError('Размер блока должен быть положительным')
+    chunks = source
+    if hasattr(source, 'read'):
+        chunks = iter_blocks(source, block_size)
+    offset = 0
+    for chunk in chunks:
+        if (index := find_zero_in_chunk(chunk)) >= 0:
+            return offset + index
+        offset += len(chunk)
+    return -1
+
+
+async def find_first_zero_stream_async(
+    source: Union[AsyncIterable[Chunk], object],
+    block_size: int = DEFAULT_BLOCK_SIZE
+        ) -> int:
+    """
+    Асинхронный вариант `find_first_zero_stream`.
+
+    `source` - асинхронный итерируемый объект частей или читатель
+    с корутиной `read(n)`, например `asyncio.StreamReader`.
+    """
+    if block_size <= 0:
+        raise ValueError('Размер блока должен быть положительным')
+    offset = 0
+    if hasattr(source, 'read'):
+        while chunk := await source.read(block_size):
+            if (index := find_zero_in_chunk(chunk)) >= 0:
+                return offset + index
+            offset += len(chunk)
+        return -1
+    async for chunk in source:
+        if (index := find_zero_in_chunk(chunk)) >= 0:
+            return offset + index
+        offset += len(chunk)
+    return -1
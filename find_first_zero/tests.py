@@ -1,12 +1,59 @@
 """
 Набор тестов для функций нахождения первого нуля в строке:
  - find_first_zero_builtin;
- - find_first_zero_with_re.
+ - find_first_zero_with_re;
+ - find_first_zero_bisect;
+ - find_first_zero_mapped;
+ - find_first_zero_batch;
+ - find_first_zero_packed;
+ - FirstZeroIndex;
+ - find_first_zero_stream;
+ - find_first_zero_parallel.
+
+Максимальную длину строки в замерах производительности
+можно задать переменной окружения FIND_FIRST_ZERO_BENCH_MAX_POWER
+(степень десяти, по умолчанию 7; 9 требует ~1 ГБ памяти).
 """
 
+import asyncio
+import io
+import json
+import math
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+import mmap
+import os
+import random
+import sys
+import tempfile
+import timeit
+import tracemalloc
 import unittest
+from unittest import mock
+
+import numpy as np
 
-from find_first_zero import find_first_zero_builtin, find_first_zero_with_re
+from find_first_zero import (
+    NotMonotonicStringException,
+    find_first_zero_bisect,
+    find_first_zero_builtin,
+    find_first_zero_with_re
+)
+import benchmark
+from batch_search import as_char_matrix, find_first_zero_batch
+from mapped_search import find_first_zero_mapped
+from parallel_search import find_first_zero_parallel
+from packed_search import find_first_zero_packed, pack_bits, unpack_bits
+from stream_search import (
+    find_first_zero_stream,
+    find_first_zero_stream_async
+)
+from zero_index import FirstZeroIndex
+
+BENCH_MAX_POWER = int(os.environ.get('FIND_FIRST_ZERO_BENCH_MAX_POWER', 7))
+#  Таблица времени печатается только по запросу: те же замеры
+#  выводит `benchmark.py`.
+BENCH_VERBOSE = bool(os.environ.get('FIND_FIRST_ZERO_BENCH_VERBOSE'))
 
 
 def make_tests(func: callable) -> unittest.TestCase:
@@ -107,5 +154,602 @@ class TestRegExp(make_tests(find_first_zero_with_re)):
     pass
 
 
+class TestBisect(unittest.TestCase):
+    """ Тесты для функции, использующей бинарный поиск. """
+
+    def setUp(self):
+        self.monotonic = {
+            '11111111111111111111': 'Строка не содержит нулей.',
+            '00000000000000000000': 'Индекс первого нуля: 0.',
+            '11111111111111111110': 'Индекс первого нуля: 19.',
+            '11111111110000000000': 'Индекс первого нуля: 10.',
+            '': 'Строка не содержит нулей.',
+        }
+        self.not_monotonic = '10100101110010101100'
+        return super().setUp()
+
+    def test_monotonic_strings(self):
+        for check in ('sample', 'full', None):
+            for ones_and_zeros, expected_result in self.monotonic.items():
+                with self.subTest(check=check, string=ones_and_zeros):
+                    self.assertEqual(
+                        find_first_zero_bisect(ones_and_zeros, check=check),
+                        expected_result,
+                        msg=(
+                            'Убедитесь, что бинарный поиск находит '
+                            'границу между единицами и нулями'
+                        )
+                    )
+
+    def test_same_result_as_builtin(self):
+        for ones_and_zeros in self.monotonic:
+            with self.subTest(string=ones_and_zeros):
+                self.assertEqual(
+                    find_first_zero_bisect(ones_and_zeros),
+                    find_first_zero_builtin(ones_and_zeros)
+                )
+
+    def test_not_monotonic_full_check(self):
+        with self.assertRaises(
+            NotMonotonicStringException,
+            msg=(
+                'Убедитесь, что полная проверка обнаруживает '
+                'строку, не имеющую вида "1…10…0"'
+            )
+        ):
+            find_first_zero_bisect(self.not_monotonic, check='full')
+
+    def test_not_monotonic_sample_check(self):
+        with self.assertRaises(NotMonotonicStringException):
+            find_first_zero_bisect(self.not_monotonic, check='sample')
+
+    def test_unknown_check(self):
+        with self.assertRaises(ValueError):
+            find_first_zero_bisect('10', check='unknown')
+
+
+class ProbeCounter:
+    """
+    Строка вида '1…10…0' заданной длины, не хранящая символы
+    и подсчитывающая количество обращений к ним.
+    """
+
+    def __init__(self, length, zero_index):
+        self.length = length
+        self.zero_index = zero_index
+        self.probes = 0
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        self.probes += 1
+        return '1' if index < self.zero_index else '0'
+
+
+class TestBisectPerformance(unittest.TestCase):
+    """ Замеры выигрыша бинарного поиска по сравнению с str.find. """
+
+    def test_logarithmic_probes(self):
+        """ Количество обращений к символам растет как O(log n). """
+        for power in range(3, 10):
+            length = 10 ** power
+            for zero_index in (0, length // 2, length - 1, length):
+                with self.subTest(length=length, zero_index=zero_index):
+                    ones_and_zeros = ProbeCounter(length, zero_index)
+                    find_first_zero_bisect(ones_and_zeros, check=None)
+                    self.assertLessEqual(
+                        ones_and_zeros.probes,
+                        math.ceil(math.log2(length + 1)),
+                        msg=(
+                            'Убедитесь, что бинарный поиск выполняет '
+                            'не более log2(n + 1) обращений к символам'
+                        )
+                    )
+
+    def test_faster_than_str_find(self):
+        """ Сравнение времени работы с str.find для 10^3 - 10^N символов. """
+        report = ['\nдлина      str.find, мкс   bisect, мкс']
+        for power in range(3, BENCH_MAX_POWER + 1):
+            length = 10 ** power
+            ones_and_zeros = '1' * (length - 1) + '0'
+            find_time = min(timeit.repeat(
+                lambda: ones_and_zeros.find('0'), number=5, repeat=3
+            )) / 5
+            bisect_time = min(timeit.repeat(
+                lambda: find_first_zero_bisect(ones_and_zeros),
+                number=5,
+                repeat=3
+            )) / 5
+            report.append(
+                f'10^{power:<7} {find_time * 1e6:>12.1f} '
+                f'{bisect_time * 1e6:>13.1f}'
+            )
+            del ones_and_zeros
+        if BENCH_VERBOSE:
+            print('\n'.join(report), file=sys.stderr)
+        if BENCH_MAX_POWER >= 7:
+            self.assertLess(
+                bisect_time,
+                find_time,
+                msg=(
+                    'Убедитесь, что на длинных строках бинарный поиск '
+                    'работает быстрее str.find'
+                )
+            )
+
+
+class TestMappedSearch(unittest.TestCase):
+    """ Тесты поиска в файлах и двоичных буферах. """
+
+    def setUp(self):
+        self.cases = {
+            b'11111111111111111111': -1,
+            b'01111111111111111111': 0,
+            b'11111111111111111110': 19,
+            b'10100101110010101100': 1,
+            b'': -1,
+        }
+        self.temp_dir = tempfile.TemporaryDirectory()
+        return super().setUp()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def write_file(self, contents):
+        path = os.path.join(self.temp_dir.name, 'bits.log')
+        with open(path, 'wb') as file:
+            file.write(contents)
+        return path
+
+    def test_buffers(self):
+        for contents, expected_index in self.cases.items():
+            for buffer in (
+                contents,
+                bytearray(contents),
+                memoryview(contents),
+                memoryview(bytearray(contents))[0:],
+            ):
+                with self.subTest(buffer=buffer):
+                    self.assertEqual(
+                        find_first_zero_mapped(buffer),
+                        expected_index,
+                        msg=(
+                            'Убедитесь, что поиск по буферу возвращает '
+                            'смещение первого байта b"0"'
+                        )
+                    )
+
+    def test_files_and_mmap(self):
+        for contents, expected_index in self.cases.items():
+            with self.subTest(contents=contents):
+                path = self.write_file(contents)
+                self.assertEqual(find_first_zero_mapped(path), expected_index)
+                if not contents:
+                    continue
+                with open(path, 'rb') as file, mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                ) as mapped:
+                    self.assertEqual(
+                        find_first_zero_mapped(mapped), expected_index
+                    )
+
+    def test_constant_memory(self):
+        """ Поиск в файле не загружает его в память Python. """
+        size = 10 ** 7
+        path = os.path.join(self.temp_dir.name, 'large.log')
+        with open(path, 'wb') as file:
+            file.truncate(size - 1)
+            file.seek(0)
+            file.write(b'1' * 1024)
+        tracemalloc.start()
+        index = find_first_zero_mapped(path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertEqual(index, -1)
+        self.assertLess(
+            peak,
+            size // 100,
+            msg='Убедитесь, что файл не копируется в память при поиске'
+        )
+
+
+class TestBatchSearch(unittest.TestCase):
+    """ Тесты векторизованного поиска во множестве строк. """
+
+    def setUp(self):
+        self.strings = [
+            '11111111111111111111',
+            '01111111111111111111',
+            '11111111111111111110',
+            '00000000000000000000',
+            '10100101110010101100',
+            '',
+            '110',
+            '1',
+        ]
+        return super().setUp()
+
+    @staticmethod
+    def as_message(index):
+        """ Приводит индекс к формату скалярных функций. """
+        if index < 0:
+            return 'Строка не содержит нулей.'
+        return f'Индекс первого нуля: {index}.'
+
+    def test_same_result_as_scalar_functions(self):
+        for batch in (
+            self.strings,
+            tuple(self.strings),
+            np.array(self.strings),
+            np.array(self.strings, dtype='S'),
+        ):
+            indexes = find_first_zero_batch(batch)
+            self.assertEqual(indexes.dtype, np.int64)
+            for func in (find_first_zero_builtin, find_first_zero_with_re):
+                with self.subTest(batch=type(batch), func=func.__name__):
+                    self.assertEqual(
+                        [self.as_message(index) for index in indexes],
+                        [func(string) for string in self.strings],
+                        msg=(
+                            'Убедитесь, что пакетный поиск возвращает '
+                            'те же индексы, что и скалярные функции'
+                        )
+                    )
+
+    def test_str_packed_as_bytes(self):
+        """ Строки Python упаковываются по одному байту на символ. """
+        chars = as_char_matrix(self.strings)
+        self.assertEqual(chars.dtype, np.uint8)
+        self.assertEqual(chars.shape, (len(self.strings), 20))
+
+    def test_empty_batch(self):
+        self.assertEqual(find_first_zero_batch([]).shape, (0,))
+
+    def test_not_flat_batch(self):
+        with self.assertRaises(ValueError):
+            find_first_zero_batch(np.array([['10'], ['01']]))
+
+
+class TestPackedSearch(unittest.TestCase):
+    """ Тесты поиска первого нулевого бита в упакованных данных. """
+
+    def setUp(self):
+        self.strings = [
+            '11111111111111111111',
+            '01111111111111111111',
+            '11111111111111111110',
+            '00000000000000000000',
+            '10100101110010101100',
+            '',
+            '1' * 64 + '0',
+            '1' * 64 * 3 + '1' * 63 + '0' + '1' * 10,
+            '1' * 1000,
+        ]
+        return super().setUp()
+
+    def test_round_trip(self):
+        for ones_and_zeros in self.strings:
+            with self.subTest(string=ones_and_zeros):
+                self.assertEqual(
+                    unpack_bits(
+                        pack_bits(ones_and_zeros), len(ones_and_zeros)
+                    ),
+                    ones_and_zeros,
+                    msg=(
+                        'Убедитесь, что упаковка и распаковка '
+                        'не изменяют строку'
+                    )
+                )
+
+    def test_same_result_as_str_find(self):
+        for ones_and_zeros in self.strings:
+            packed = pack_bits(ones_and_zeros)
+            bit_length = len(ones_and_zeros)
+            words = array('Q', packed + b'\xff' * (-len(packed) % 8))
+            for source in (
+                packed,
+                bytearray(packed),
+                words,
+                int.from_bytes(packed, 'little'),
+            ):
+                with self.subTest(string=ones_and_zeros, source=type(source)):
+                    self.assertEqual(
+                        find_first_zero_packed(source, bit_length),
+                        ones_and_zeros.find('0'),
+                        msg=(
+                            'Убедитесь, что поиск по упакованным данным '
+                            'находит первый нулевой бит'
+                        )
+                    )
+
+    def test_zero_after_bit_length(self):
+        """ Нулевые биты за пределами `bit_length` не учитываются. """
+        self.assertEqual(find_first_zero_packed(b'\x0f', 4), -1)
+        self.assertEqual(find_first_zero_packed(0b1111, 4), -1)
+
+    def test_invalid_length(self):
+        with self.assertRaises(ValueError):
+            find_first_zero_packed(b'\xff', 9)
+        with self.assertRaises(ValueError):
+            find_first_zero_packed(b'\xff', -1)
+
+
+class TestFirstZeroIndex(unittest.TestCase):
+    """ Тесты изменяемого индекса первого нуля. """
+
+    def setUp(self):
+        self.strings = [
+            '11111111111111111111',
+            '01111111111111111111',
+            '11111111111111111110',
+            '00000000000000000000',
+            '10100101110010101100',
+            '',
+            '1' * 4096 + '0' + '1' * 100,
+        ]
+        return super().setUp()
+
+    def test_same_result_as_builtin(self):
+        for ones_and_zeros in self.strings:
+            with self.subTest(string=ones_and_zeros):
+                index = FirstZeroIndex.from_string(ones_and_zeros)
+                self.assertEqual(index.to_string(), ones_and_zeros)
+                self.assertEqual(
+                    TestBatchSearch.as_message(index.find_first_zero()),
+                    find_first_zero_builtin(ones_and_zeros),
+                    msg=(
+                        'Убедитесь, что индекс возвращает тот же результат, '
+                        'что и find_first_zero_builtin'
+                    )
+                )
+
+    def test_slot_allocator(self):
+        """ Последовательное занятие и освобождение ячеек. """
+        index = FirstZeroIndex(200)
+        for expected_slot in range(200):
+            slot = index.find_first_zero()
+            self.assertEqual(slot, expected_slot)
+            index.set(slot)
+        self.assertEqual(index.find_first_zero(), -1)
+        index.clear(130)
+        index.clear(70)
+        self.assertEqual(index.find_first_zero(), 70)
+        self.assertEqual(index.find_first_zero_from(71), 130)
+        self.assertEqual(index.find_first_zero_from(131), -1)
+
+    def test_random_updates(self):
+        """ Случайные изменения сверяются со str.find. """
+        generator = random.Random(5)
+        size = 64 ** 2 + 17
+        flags = ['1'] * size
+        index = FirstZeroIndex.from_string(''.join(flags))
+        for _ in range(2000):
+            position = generator.randrange(size)
+            if generator.random() < 0.3:
+                index.clear(position)
+                flags[position] = '0'
+            else:
+                index.set(position)
+                flags[position] = '1'
+            start = generator.randrange(size + 1)
+            ones_and_zeros = ''.join(flags)
+            self.assertEqual(
+                index.find_first_zero(), ones_and_zeros.find('0')
+            )
+            self.assertEqual(
+                index.find_first_zero_from(start),
+                ones_and_zeros.find('0', start)
+            )
+
+    def test_out_of_range(self):
+        index = FirstZeroIndex(10)
+        with self.assertRaises(IndexError):
+            index.set(10)
+        with self.assertRaises(IndexError):
+            index.clear(-1)
+
+
+class TestStreamSearch(unittest.TestCase):
+    """ Тесты потокового поиска первого нуля. """
+
+    def setUp(self):
+        self.cases = {
+            '11111111111111111111': -1,
+            '01111111111111111111': 0,
+            '11111111111111111110': 19,
+            '10100101110010101100': 1,
+            '': -1,
+        }
+        return super().setUp()
+
+    @staticmethod
+    def split(ones_and_zeros, size):
+        return [
+            ones_and_zeros[i:i + size]
+            for i in range(0, len(ones_and_zeros), size)
+        ]
+
+    def test_chunks(self):
+        for ones_and_zeros, expected_index in self.cases.items():
+            for size in (1, 3, 7, 50):
+                chunks = self.split(ones_and_zeros, size)
+                with self.subTest(string=ones_and_zeros, size=size):
+                    self.assertEqual(
+                        find_first_zero_stream(chunks), expected_index
+                    )
+                    self.assertEqual(
+                        find_first_zero_stream(
+                            chunk.encode() for chunk in chunks
+                        ),
+                        expected_index,
+                        msg=(
+                            'Убедитесь, что смещение считается '
+                            'с учетом предыдущих частей'
+                        )
+                    )
+
+    def test_file_objects(self):
+        for ones_and_zeros, expected_index in self.cases.items():
+            with self.subTest(string=ones_and_zeros):
+                self.assertEqual(
+                    find_first_zero_stream(
+                        io.StringIO(ones_and_zeros), block_size=3
+                    ),
+                    expected_index
+                )
+                self.assertEqual(
+                    find_first_zero_stream(
+                        io.BytesIO(ones_and_zeros.encode()), block_size=3
+                    ),
+                    expected_index
+                )
+
+    def test_early_exit(self):
+        """ Чтение прекращается после нахождения нуля. """
+        file = io.BytesIO(b'1110' + b'1' * 1000)
+        self.assertEqual(find_first_zero_stream(file, block_size=8), 3)
+        self.assertEqual(file.tell(), 8)
+
+        def endless_chunks():
+            yield '11'
+            yield '10'
+            raise AssertionError('Чтение продолжилось после нахождения нуля')
+
+        self.assertEqual(find_first_zero_stream(endless_chunks()), 3)
+
+    def test_async_reader(self):
+        async def search(ones_and_zeros):
+            reader = asyncio.StreamReader()
+            reader.feed_data(ones_and_zeros.encode())
+            reader.feed_eof()
+            return await find_first_zero_stream_async(reader, block_size=3)
+
+        async def search_chunks(ones_and_zeros):
+            async def chunks():
+                for chunk in self.split(ones_and_zeros, 4):
+                    yield chunk
+            return await find_first_zero_stream_async(chunks())
+
+        for ones_and_zeros, expected_index in self.cases.items():
+            with self.subTest(string=ones_and_zeros):
+                self.assertEqual(
+                    asyncio.run(search(ones_and_zeros)), expected_index
+                )
+                self.assertEqual(
+                    asyncio.run(search_chunks(ones_and_zeros)),
+                    expected_index
+                )
+
+
+class TestParallelSearch(unittest.TestCase):
+    """ Тесты многопроцессного поиска в файлах. """
+
+    def setUp(self):
+        self.size = 100_000
+        self.segment_size = 8_192
+        self.temp_dir = tempfile.TemporaryDirectory()
+        return super().setUp()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def write_file(self, zero_index):
+        contents = bytearray(b'1' * self.size)
+        if zero_index is not None:
+            contents[zero_index] = ord('0')
+            contents[-1] = ord('0')
+        path = os.path.join(self.temp_dir.name, f'bits_{zero_index}.log')
+        with open(path, 'wb') as file:
+            file.write(contents)
+        return path, contents.find(b'0')
+
+    def test_same_result_as_find(self):
+        for zero_index in (0, 8_191, 8_192, 50_000, self.size - 1, None):
+            path, expected_index = self.write_file(zero_index)
+            with self.subTest(zero_index=zero_index):
+                self.assertEqual(
+                    find_first_zero_parallel(
+                        path,
+                        workers=2,
+                        segment_size=self.segment_size,
+                        threshold=0
+                    ),
+                    expected_index,
+                    msg=(
+                        'Убедитесь, что параллельный поиск возвращает '
+                        'наименьшее смещение нуля'
+                    )
+                )
+
+    def test_fallback_below_threshold(self):
+        """ Небольшие файлы и буферы не требуют пула процессов. """
+        path, expected_index = self.write_file(500)
+        with mock.patch(
+            'parallel_search.ProcessPoolExecutor',
+            side_effect=AssertionError('Пул процессов не должен создаваться')
+        ):
+            self.assertEqual(find_first_zero_parallel(path), expected_index)
+            self.assertEqual(
+                find_first_zero_parallel(b'110', threshold=0), 2
+            )
+
+    def test_no_wait_after_hit(self):
+        """ После нахождения нуля оставшиеся сегменты не ожидаются. """
+        shutdowns = []
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def shutdown(self, wait=True, *, cancel_futures=False):
+                shutdowns.append((wait, cancel_futures))
+                super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+        path, expected_index = self.write_file(10)
+        with mock.patch(
+            'parallel_search.ProcessPoolExecutor', RecordingExecutor
+        ):
+            self.assertEqual(
+                find_first_zero_parallel(
+                    path,
+                    workers=1,
+                    segment_size=self.segment_size,
+                    threshold=0
+                ),
+                expected_index
+            )
+        self.assertEqual(shutdowns[0], (False, True))
+
+
+class TestBenchmark(unittest.TestCase):
+    """ Проверка работы набора замеров производительности. """
+
+    def test_json_report(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'results.json')
+            with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout:
+                benchmark.main([
+                    '--min-power', '1',
+                    '--max-power', '2',
+                    '--number', '1',
+                    '--json', path,
+                ])
+            with open(path) as file:
+                report = json.load(file)
+        self.assertIn('python', report['environment'])
+        self.assertEqual(
+            len(report['results']),
+            2 * len(benchmark.ZERO_POSITIONS) * len(benchmark.ENGINES),
+            msg=(
+                'Убедитесь, что замеры выполняются для всех сочетаний '
+                'длины, положения нуля и функции'
+            )
+        )
+        for result in report['results']:
+            self.assertGreater(result['throughput'], 0)
+            self.assertGreaterEqual(result['peak_memory_bytes'], 0)
+        self.assertIn('find_first_zero_with_re', stdout.getvalue())
+
+
 if __name__ == '__main__':
     unittest.main()
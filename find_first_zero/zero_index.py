@@ -0,0 +1,150 @@
+"""
+Изменяемый индекс первого нуля на основе иерархической битовой карты.
+
+Нижний уровень хранит сами флаги: бит i равен 1, если ячейка i занята.
+Бит k слова w каждого следующего уровня равен 1, если слово
+с индексом w * 64 + k предыдущего уровня полностью заполнено единицами.
+
+Операции `set`, `clear`, `find_first_zero` и `find_first_zero_from`
+выполняются за O(log_64 n): на каждом уровне обрабатывается одно слово.
+Все уровни хранятся в массивах `array('Q')`.
+"""
+
+import sys
+from array import array
+from typing import List
+
+from packed_search import lowest_zero_bit, pack_bits, unpack_bits
+
+WORD_BITS = 64
+FULL_WORD = (1 << WORD_BITS) - 1
+
+
+class FirstZeroIndex:
+    """
+    Битовая карта занятых ячеек с быстрым поиском первой свободной.
+    Ячейки за пределами `size` считаются занятыми.
+    """
+
+    def __init__(self, size: int) -> None:
+        if size < 0:
+            raise ValueError('Размер индекса не может быть отрицательным')
+        self.size = size
+        words = array('Q', bytes(8 * self._word_count(size)))
+        self._levels = self._build_levels(words, size)
+
+    @classmethod
+    def from_string(cls, ones_and_zeros: str) -> 'FirstZeroIndex':
+        """ Создает индекс из строки '0'/'1' (единица - занятая ячейка). """
+        size = len(ones_and_zeros)
+        index = cls(size)
+        words = array('Q')
+        words.frombytes(
+            pack_bits(ones_and_zeros).ljust(8 * cls._word_count(size), b'\0')
+        )
+        if sys.byteorder == 'big':
+            words.byteswap()
+        index._levels = cls._build_levels(words, size)
+        return index
+
+    @staticmethod
+    def _word_count(size: int) -> int:
+        """ Количество слов нижнего уровня (хотя бы одно). """
+        return max(-(-size // WORD_BITS), 1)
+
+    @staticmethod
+    def _build_levels(words: array, size: int) -> List[array]:
+        """
+        Заполняет единицами биты за пределами `size`
+        и строит верхние уровни карты.
+        """
+        levels = [words]
+        length = size
+        while True:
+            level = levels[-1]
+            last_word_length = length - (len(level) - 1) * WORD_BITS
+            level[-1] |= FULL_WORD ^ ((1 << last_word_length) - 1)
+            if len(level) == 1:
+                return levels
+            length = len(level)
+            parent = array('Q', bytes(8 * -(-length // WORD_BITS)))
+            for position, word in enumerate(level):
+                if word == FULL_WORD:
+                    parent[position // WORD_BITS] |= (
+                        1 << position % WORD_BITS
+                    )
+            levels.append(parent)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, position: int) -> int:
+        self._check_position(position)
+        word, bit = divmod(position, WORD_BITS)
+        return self._levels[0][word] >> bit & 1
+
+    def _check_position(self, position: int) -> None:
+        if not 0 <= position < self.size:
+            raise IndexError(f'Индекс {position} вне диапазона индекса')
+
+    def set(self, position: int) -> None:
+        """ Отмечает ячейку занятой. """
+        self._check_position(position)
+        for level in self._levels:
+            word, bit = divmod(position, WORD_BITS)
+            level[word] |= 1 << bit
+            if level[word] != FULL_WORD:
+                return
+            position = word
+
+    def clear(self, position: int) -> None:
+        """ Отмечает ячейку свободной. """
+        self._check_position(position)
+        for level in self._levels:
+            word, bit = divmod(position, WORD_BITS)
+            was_full = level[word] == FULL_WORD
+            level[word] &= FULL_WORD ^ (1 << bit)
+            if not was_full:
+                return
+            position = word
+
+    def find_first_zero(self) -> int:
+        """ Индекс первой свободной ячейки или -1. """
+        return self.find_first_zero_from(0)
+
+    def find_first_zero_from(self, start: int) -> int:
+        """
+        Индекс первой свободной ячейки, не меньший `start`, или -1.
+
+        Поднимаемся по уровням, пока не найдем слово со свободным битом
+        правее текущей позиции, затем спускаемся к нижнему уровню.
+        """
+        if start < 0:
+            raise ValueError('Начальный индекс не может быть отрицательным')
+        position = start
+        depth = 0
+        for level in self._levels:
+            word, bit = divmod(position, WORD_BITS)
+            if word >= len(level):
+                return -1
+            masked_word = level[word] | ((1 << bit) - 1)
+            if masked_word != FULL_WORD:
+                position = word * WORD_BITS + lowest_zero_bit(masked_word)
+                break
+            position = word + 1
+            depth += 1
+        else:
+            return -1
+
+        for level in reversed(self._levels[:depth]):
+            position = (
+                position * WORD_BITS + lowest_zero_bit(level[position])
+            )
+        return position
+
+    def to_string(self) -> str:
+        """ Представляет содержимое индекса строкой '0'/'1'. """
+        words = array('Q', self._levels[0])
+        if sys.byteorder == 'big':
+            words.byteswap()
+        return unpack_bits(words, self.size)
@@ -0,0 +1,99 @@
+"""
+Индекс общего присутствия ученика и учителя для многократных запросов.
+
+Индекс строится один раз по массивам `pupil` и `tutor`: интервалы каждого
+массива объединяются, затем находятся их пересечения. Начала и концы
+общих интервалов, а также префиксные суммы их длительностей хранятся
+в массивах `array('q')`.
+
+Продолжительность общих интервалов в любом окне [start, end]
+(урок, час, произвольный период) находится бинарным поиском за O(log n).
+Аргумент `lesson` функции `appearence` соответствует одному такому запросу.
+
+Так как интервалы массивов предварительно объединяются, результат -
+длительность пересечения объединений интервалов ученика и учителя.
+На массивах без пересекающихся интервалов он совпадает
+с `appearence`. На частично пересекающихся интервалах одного массива
+результаты расходятся: двухуказательный обход `appearence` может
+учесть общую часть повторно. Например, для pupil=[10, 30, 20, 40]
+и tutor=[0, 50] `appearence` возвращает 40, а индекс - 30
+(как и `appearence(..., normalize=True)`).
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, Sequence, Tuple
+
+from find_lesson_intervals import normalize_intervals
+
+
+def intersect_intervals(
+    first: List[int],
+    second: List[int]
+        ) -> Iterator[Tuple[int, int]]:
+    """
+    Пересечения двух отсортированных массивов
+    непересекающихся интервалов. Пустые пересечения пропускаются.
+    """
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i], second[j])
+        end = min(first[i+1], second[j+1])
+        if start < end:
+            yield start, end
+        if first[i+1] < second[j+1]:
+            i += 2
+        else:
+            j += 2
+
+
+class AttendanceIndex:
+    """ Общие интервалы ученика и учителя с префиксными суммами. """
+
+    def __init__(self, pupil: Sequence[int], tutor: Sequence[int]) -> None:
+        """
+        Строит индекс. Массивы сортируются, а пересекающиеся
+        интервалы объединяются (см. `normalize_intervals`).
+        """
+        pupil, _ = normalize_intervals(pupil)
+        tutor, _ = normalize_intervals(tutor)
+        self.starts = array('q')
+        self.ends = array('q')
+        self.prefix_sums = array('q', [0])
+        for start, end in intersect_intervals(pupil, tutor):
+            self.starts.append(start)
+            self.ends.append(end)
+            self.prefix_sums.append(self.prefix_sums[-1] + end - start)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def query(self, start: int, end: int) -> int:
+        """
+        Продолжительность общих интервалов в окне [start, end].
+
+        Бинарным поиском находятся первый интервал, заканчивающийся
+        после `start`, и первый интервал, начинающийся не раньше `end`.
+        Сумма интервалов между ними берется из префиксных сумм,
+        затем отсекаются части крайних интервалов за пределами окна.
+        Для пустого или перевернутого окна (`start >= end`)
+        возвращается 0, как и в `appearence`.
+        """
+        if start >= end:
+            return 0
+        first = bisect_right(self.ends, start)
+        last = bisect_left(self.starts, end)
+        if first >= last:
+            return 0
+        return (
+            self.prefix_sums[last] - self.prefix_sums[first]
+            - max(start - self.starts[first], 0)
+            - max(self.ends[last - 1] - end, 0)
+        )
+
+    def query_lesson(self, lesson: Sequence[int]) -> int:
+        """
+        Продолжительность общих интервалов в пределах урока.
+        Совпадает с `appearence(lesson, pupil, tutor, normalize=True)`.
+        """
+        return self.query(lesson[0], lesson[1])
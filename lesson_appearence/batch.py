@@ -0,0 +1,167 @@
+"""
+Пакетный расчет общего времени ученика и учителя
+для большого количества уроков на пуле процессов.
+
+Данные уроков хранятся в колоночном виде:
+ - `lessons` - плоский массив [начало_0, конец_0, начало_1, конец_1, ...];
+ - `pupil_values` - значения интервалов учеников всех уроков подряд;
+ - `pupil_offsets` - границы уроков в `pupil_values`
+   (интервалы урока k: pupil_values[offsets[k]:offsets[k + 1]]);
+ - `tutor_values`, `tutor_offsets` - аналогично для учителей.
+
+Процессам передаются только срезы массивов NumPy своей части уроков,
+которые сериализуются одним блоком памяти без поэлементной упаковки.
+
+В отличие от `appearence`, пакетный расчет никогда не вызывает
+`input()` и `sys.exit`: ошибки валидации поднимаются как исключения.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from find_lesson_intervals import run_validation, sum_lesson_intervals
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+LessonArrays = Tuple[Sequence[int], Sequence[int], Sequence[int]]
+
+
+def to_columnar(lessons: Iterable[LessonArrays]):
+    """
+    Преобразует тройки (lesson, pupil, tutor) в колоночный вид.
+    Возвращает (lessons, pupil_values, pupil_offsets,
+    tutor_values, tutor_offsets).
+    """
+    lesson_values = []
+    pupil_values, pupil_offsets = [], [0]
+    tutor_values, tutor_offsets = [], [0]
+    for lesson, pupil, tutor in lessons:
+        if len(lesson) != 2:
+            raise ValueError('Массив `lesson` должен содержать два элемента')
+        lesson_values.extend(lesson)
+        pupil_values.extend(pupil)
+        pupil_offsets.append(len(pupil_values))
+        tutor_values.extend(tutor)
+        tutor_offsets.append(len(tutor_values))
+    return tuple(
+        np.array(values, dtype=np.int64)
+        for values in (
+            lesson_values,
+            pupil_values, pupil_offsets,
+            tutor_values, tutor_offsets,
+        )
+    )
+
+
+def sum_lessons_chunk(
+    lessons: np.ndarray,
+    pupil_values: np.ndarray,
+    pupil_offsets: np.ndarray,
+    tutor_values: np.ndarray,
+    tutor_offsets: np.ndarray,
+    validate: bool = True
+        ) -> np.ndarray:
+    """
+    Рассчитывает продолжительность общих интервалов
+    для части уроков. Смещения отсчитываются от начала переданных значений.
+    """
+    lessons = lessons.tolist()
+    pupil_values, pupil_offsets = pupil_values.tolist(), pupil_offsets.tolist()
+    tutor_values, tutor_offsets = tutor_values.tolist(), tutor_offsets.tolist()
+    durations = np.empty(len(pupil_offsets) - 1, dtype=np.int64)
+    for k in range(len(durations)):
+        lesson = lessons[2 * k:2 * k + 2]
+        pupil = pupil_values[pupil_offsets[k]:pupil_offsets[k + 1]]
+        tutor = tutor_values[tutor_offsets[k]:tutor_offsets[k + 1]]
+        if validate:
+            run_validation(
+                lesson, pupil, tutor, raise_overlap_exception=False
+            )
+        durations[k] = sum_lesson_intervals(lesson, pupil, tutor)
+    return durations
+
+
+def iter_chunks(
+    lessons: np.ndarray,
+    pupil_values: np.ndarray,
+    pupil_offsets: np.ndarray,
+    tutor_values: np.ndarray,
+    tutor_offsets: np.ndarray,
+    chunk_size: int
+        ):
+    """ Делит колоночные данные на части по `chunk_size` уроков. """
+    count = len(pupil_offsets) - 1
+    for start in range(0, count, chunk_size):
+        end = min(start + chunk_size, count)
+        pupil_start, pupil_end = pupil_offsets[start], pupil_offsets[end]
+        tutor_start, tutor_end = tutor_offsets[start], tutor_offsets[end]
+        yield (
+            lessons[2 * start:2 * end],
+            pupil_values[pupil_start:pupil_end],
+            pupil_offsets[start:end + 1] - pupil_start,
+            tutor_values[tutor_start:tutor_end],
+            tutor_offsets[start:end + 1] - tutor_start,
+        )
+
+
+def batch_appearence_columnar(
+    lessons: Sequence[int],
+    pupil_values: Sequence[int],
+    pupil_offsets: Sequence[int],
+    tutor_values: Sequence[int],
+    tutor_offsets: Sequence[int],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    validate: bool = True
+        ) -> np.ndarray:
+    """
+    Рассчитывает продолжительность общих интервалов для всех уроков.
+    Возвращает массив `int64` длительностей в порядке уроков.
+
+    `workers=1` или количество уроков не больше `chunk_size`
+    означает расчет в текущем процессе.
+    """
+    if chunk_size <= 0:
+        raise ValueError('Размер части должен быть положительным')
+    columns = [
+        np.asarray(column, dtype=np.int64)
+        for column in (
+            lessons, pupil_values, pupil_offsets, tutor_values, tutor_offsets
+        )
+    ]
+    count = len(columns[2]) - 1
+    if len(columns[4]) != count + 1 or len(columns[0]) != 2 * count:
+        raise ValueError('Количество уроков в колонках не совпадает')
+    chunks = list(iter_chunks(*columns, chunk_size))
+    if not chunks:
+        return np.empty(0, dtype=np.int64)
+    if workers == 1 or len(chunks) == 1:
+        results = [sum_lessons_chunk(*chunk, validate) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                sum_lessons_chunk,
+                *zip(*chunks),
+                [validate] * len(chunks)
+            ))
+    return np.concatenate(results)
+
+
+def batch_appearence(
+    lessons: Iterable[LessonArrays],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    validate: bool = True
+        ) -> np.ndarray:
+    """
+    Рассчитывает продолжительность общих интервалов
+    для последовательности троек (lesson, pupil, tutor).
+    """
+    return batch_appearence_columnar(
+        *to_columnar(lessons),
+        workers=workers,
+        chunk_size=chunk_size,
+        validate=validate
+    )
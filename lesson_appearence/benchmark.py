@@ -0,0 +1,353 @@
+"""
+Генератор журналов присутствия, сравнение реализаций расчета общего
+времени с эталоном и замеры производительности.
+
+Режимы запуска:
+ - fuzz - случайные журналы небольшого размера, результаты всех
+   реализаций сверяются с посекундным эталонным расчетом;
+ - bench - журналы от 10 до 10^7 интервалов (частота переподключений
+   и доля пересекающихся интервалов задаются параметрами
+   `--reconnect-gap` и `--overlap`), для каждой реализации
+   измеряются пропускная способность (интервалов в секунду)
+   и пиковое потребление памяти. Результаты выводятся таблицей
+   и, при указании `--json`, сохраняются в машиночитаемом виде.
+
+Пример запуска:
+    (.../lesson_appearence$) python3 benchmark.py fuzz --cases 1000
+    (.../lesson_appearence$) python3 benchmark.py bench --max-power 6
+    (.../lesson_appearence$) python3 benchmark.py bench --overlap 0.3
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from attendance_index import AttendanceIndex
+from find_lesson_intervals import (
+    collect_lesson_intervals,
+    collect_lesson_intervals_compact,
+    sum_intervals,
+    sum_lesson_intervals
+)
+from group_overlap import sweep_attendance
+from live_overlap import accumulate_arrays
+from numpy_engine import sum_lesson_intervals_numpy
+
+
+class Engine(NamedTuple):
+    """
+    Реализация расчета и признак поддержки пересекающихся
+    интервалов внутри одного массива.
+    """
+    name: str
+    compute: Callable[[Sequence[int], Sequence[int], Sequence[int]], int]
+    supports_overlap: bool
+
+
+ENGINES = (
+    Engine(
+        'collect_lesson_intervals',
+        lambda lesson, pupil, tutor: sum_intervals(
+            collect_lesson_intervals(lesson, pupil, tutor)
+        ),
+        False
+    ),
+    Engine(
+        'collect_lesson_intervals_compact',
+        lambda lesson, pupil, tutor: collect_lesson_intervals_compact(
+            lesson, pupil, tutor
+        ).total(),
+        False
+    ),
+    Engine('sum_lesson_intervals', sum_lesson_intervals, False),
+    Engine('sum_lesson_intervals_numpy', sum_lesson_intervals_numpy, True),
+    Engine(
+        'AttendanceIndex',
+        lambda lesson, pupil, tutor: AttendanceIndex(
+            pupil, tutor
+        ).query_lesson(lesson),
+        True
+    ),
+    Engine('accumulate_arrays', accumulate_arrays, True),
+    Engine(
+        'sweep_attendance',
+        lambda lesson, pupil, tutor: sweep_attendance(
+            lesson, [pupil, tutor]
+        ).all_present,
+        True
+    ),
+)
+
+
+def generate_presence(
+    generator: random.Random,
+    intervals: int,
+    lesson: Sequence[int],
+    reconnect_gap: float = 30,
+    overlap: float = 0.0
+        ) -> List[int]:
+    """
+    Случайный журнал присутствия одного участника из `intervals` интервалов.
+
+    Участник подключается незадолго до начала урока, а отключения
+    длятся в среднем `reconnect_gap` секунд. Доля `overlap` интервалов
+    начинается до окончания предыдущего (например, повторное
+    подключение из второй вкладки браузера).
+    Интервалы отсортированы по началу.
+    """
+    lesson_start, lesson_end = lesson
+    mean_length = max((lesson_end - lesson_start) / intervals, 1)
+    time = lesson_start - int(generator.expovariate(1 / mean_length))
+    previous_end = None
+    array = []
+    for _ in range(intervals):
+        if previous_end is not None and generator.random() < overlap:
+            start = generator.randint(array[-2], previous_end)
+        else:
+            start = time + 1 + int(generator.expovariate(1 / reconnect_gap))
+        end = start + 1 + int(generator.expovariate(1 / mean_length))
+        array.extend((start, end))
+        previous_end = end
+        time = max(time, end)
+    return array
+
+
+def brute_force_duration(
+    lesson: Sequence[int],
+    pupil: Sequence[int],
+    tutor: Sequence[int]
+        ) -> int:
+    """
+    Эталонный посекундный расчет: количество секунд урока,
+    в которые присутствовали и ученик, и учитель.
+    """
+    def seconds(array):
+        present = set()
+        for i in range(0, len(array), 2):
+            present.update(range(array[i], array[i + 1]))
+        return present
+
+    lesson_seconds = set(range(lesson[0], lesson[1]))
+    return len(lesson_seconds & seconds(pupil) & seconds(tutor))
+
+
+def run_fuzz(
+    cases: int,
+    max_intervals: int = 20,
+    seed: Optional[int] = None,
+    engines=ENGINES,
+    overlap: Optional[float] = None
+        ) -> List[Dict]:
+    """
+    Сверяет все реализации с эталоном на случайных журналах.
+    `overlap` - доля пересекающихся интервалов (None - случайно
+    0 или 0.3 для каждого журнала). Реализации без поддержки
+    пересекающихся интервалов проверяются только на журналах без них.
+    Возвращает список расхождений.
+    """
+    generator = random.Random(seed)
+    mismatches = []
+    for _ in range(cases):
+        lesson_start = generator.randint(0, 1000)
+        lesson = [lesson_start, lesson_start + generator.randint(1, 1000)]
+        case_overlap = (
+            generator.choice((0.0, 0.0, 0.3)) if overlap is None else overlap
+        )
+        arrays = {
+            'lesson': lesson,
+            'pupil': generate_presence(
+                generator, generator.randint(1, max_intervals), lesson,
+                reconnect_gap=generator.randint(1, 100),
+                overlap=case_overlap
+            ),
+            'tutor': generate_presence(
+                generator, generator.randint(1, max_intervals), lesson,
+                reconnect_gap=generator.randint(1, 100),
+                overlap=case_overlap
+            ),
+        }
+        expected = brute_force_duration(**arrays)
+        for engine in engines:
+            if case_overlap and not engine.supports_overlap:
+                continue
+            result = engine.compute(**arrays)
+            if result != expected:
+                mismatches.append({
+                    'engine': engine.name,
+                    'expected': expected,
+                    'result': result,
+                    **arrays,
+                })
+    return mismatches
+
+
+def measure(
+    engine: Engine,
+    arrays: Dict[str, List[int]],
+    number: Optional[int] = None
+        ) -> Dict[str, float]:
+    """
+    Время одного расчета и пиковая память Python-аллокаций.
+    Если `number` не указан, количество вызовов подбирается автоматически.
+    """
+    timer = timeit.Timer(lambda: engine.compute(**arrays))
+    if number is None:
+        number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=3, number=number)) / number
+
+    tracemalloc.start()
+    engine.compute(**arrays)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': seconds, 'peak_memory_bytes': peak_memory}
+
+
+def run_benchmark(
+    powers: range,
+    engines=ENGINES,
+    reconnect_gap: float = 30,
+    overlap: float = 0.0,
+    seed: int = 0,
+    number: Optional[int] = None
+        ) -> List[Dict]:
+    """
+    Выполняет замеры для журналов из 10^power интервалов.
+    `reconnect_gap` и `overlap` передаются в `generate_presence`.
+    """
+    generator = random.Random(seed)
+    results = []
+    for power in powers:
+        intervals = 10 ** power
+        lesson = [0, 60 * intervals]
+        arrays = {
+            'lesson': lesson,
+            'pupil': generate_presence(
+                generator, intervals // 2, lesson, reconnect_gap, overlap
+            ),
+            'tutor': generate_presence(
+                generator, intervals - intervals // 2, lesson,
+                reconnect_gap, overlap
+            ),
+        }
+        for engine in engines:
+            measurement = measure(engine, arrays, number)
+            results.append({
+                'engine': engine.name,
+                'intervals': intervals,
+                'intervals_per_second': intervals / measurement['seconds'],
+                **measurement,
+            })
+        del arrays
+    return results
+
+
+def format_table(results: List[Dict]) -> str:
+    """ Форматирует результаты в текстовую таблицу. """
+    header = (
+        f'{"реализация":<34} {"интервалов":>10} '
+        f'{"интервалов/с":>13} {"память, Б":>12}'
+    )
+    rows = [header, '-' * len(header)]
+    for result in results:
+        rows.append(
+            f'{result["engine"]:<34} {result["intervals"]:>10} '
+            f'{result["intervals_per_second"]:>13.2e} '
+            f'{result["peak_memory_bytes"]:>12}'
+        )
+    return '\n'.join(rows)
+
+
+def main(argv=None) -> None:
+    """
+    Точка входа командной строки: `fuzz` - сверка реализаций
+    с эталоном, `bench` - замеры производительности.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+
+    fuzz_parser = subparsers.add_parser(
+        'fuzz', help='сравнение реализаций с эталоном'
+    )
+    fuzz_parser.add_argument('--cases', type=int, default=1000)
+    fuzz_parser.add_argument('--max-intervals', type=int, default=20)
+    fuzz_parser.add_argument('--seed', type=int)
+    fuzz_parser.add_argument(
+        '--overlap', type=float,
+        help='доля пересекающихся интервалов (по умолчанию - случайная)'
+    )
+
+    bench_parser = subparsers.add_parser('bench', help='замеры')
+    bench_parser.add_argument(
+        '--min-power', type=int, default=1,
+        help='минимальное количество интервалов, степень десяти'
+    )
+    bench_parser.add_argument(
+        '--max-power', type=int, default=6,
+        help='максимальное количество интервалов, степень десяти (до 7)'
+    )
+    bench_parser.add_argument(
+        '--reconnect-gap', type=float, default=30,
+        help='средняя продолжительность отключения, секунд'
+    )
+    bench_parser.add_argument(
+        '--overlap', type=float, default=0.0,
+        help='доля интервалов, начинающихся до окончания предыдущего'
+    )
+    bench_parser.add_argument(
+        '--engine', action='append',
+        help='ограничить замеры указанными реализациями'
+    )
+    bench_parser.add_argument(
+        '--number', type=int,
+        help='количество вызовов в замере (по умолчанию подбирается)'
+    )
+    bench_parser.add_argument(
+        '--json', help='путь к файлу для сохранения JSON'
+    )
+    args = parser.parse_args(argv)
+
+    if args.mode == 'fuzz':
+        mismatches = run_fuzz(
+            args.cases, args.max_intervals, args.seed, overlap=args.overlap
+        )
+        for mismatch in mismatches:
+            print(json.dumps(mismatch, ensure_ascii=False))
+        if mismatches:
+            sys.exit(f'Найдено расхождений: {len(mismatches)}.')
+        print(f'Расхождений не найдено ({args.cases} журналов).')
+        return
+
+    engines = [
+        engine for engine in ENGINES
+        if not args.engine or engine.name in args.engine
+    ]
+    results = run_benchmark(
+        range(args.min_power, args.max_power + 1),
+        engines,
+        reconnect_gap=args.reconnect_gap,
+        overlap=args.overlap,
+        number=args.number
+    )
+    print(format_table(results))
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(
+                {
+                    'python': platform.python_version(),
+                    'reconnect_gap': args.reconnect_gap,
+                    'overlap': args.overlap,
+                    'results': results,
+                },
+                file,
+                ensure_ascii=False,
+                indent=2
+            )
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -20,9 +20,17 @@
 Если вы не хотите получать предупреждение о наличии
 пересекающихся интервалов, установите флаг `raise_overlap_exception`
 функции `appearence` равным `False`.
+
+Флаг `normalize` функции `appearence` включает неинтерактивный режим:
+массивы сортируются, пересекающиеся и вложенные интервалы объединяются,
+после чего рассчитываются общие интервалы. Количество объединенных
+интервалов добавляется к результату только при флаге `report_merged`.
 """
 import sys
-from typing import List, Sequence, Tuple
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import instrumentation
 
 
 class IntervalsBaseException(Exception):
@@ -33,9 +41,14 @@ class IntervalsBaseException(Exception):
     exception_description = 'Not implemented'
 
     def __init__(self, array_name: str) -> None:
+        self.array_name = array_name
         self.message = f'Массив `{array_name}` {self.exception_description}'
         super().__init__(self.message)
 
+    def __reduce__(self):
+        """ Сохраняет имя массива при передаче исключения между процессами. """
+        return self.__class__, (self.array_name,)
+
 
 class IntervalOverlapException(IntervalsBaseException):
     """
@@ -101,53 +114,83 @@ def validate_overlap_intervals(array: Sequence[int], name: str) -> None:
     Вызывать исключение, если в массиве
     есть пересекающиеся интервалы.
     """
-    len_array = len(array)
-    current_interval = array[:2]
-    i = 2
+    for i in range(2, len(array), 2):
+        if array[i] <= array[i-1]:
+            raise IntervalOverlapException(name)
+
 
-    while i < len_array:
-        if array[i] > current_interval[1]:
-            current_interval = array[i:i+2]
-            i += 2
+def normalize_intervals(array: Sequence[int]) -> Tuple[List[int], int]:
+    """
+    Сортирует интервалы по началу и объединяет пересекающиеся,
+    вложенные и соприкасающиеся интервалы за один проход.
+
+    Сортировка выполняется, только если массив не отсортирован,
+    поэтому для отсортированного массива сложность O(n).
+    Возвращает новый массив и количество объединенных интервалов.
+    """
+    starts = range(0, len(array), 2)
+    if any(array[i] > array[i+2] for i in range(0, len(array) - 2, 2)):
+        starts = sorted(starts, key=array.__getitem__)
+
+    normalized = []
+    merged_count = 0
+    for i in starts:
+        start, end = array[i], array[i+1]
+        if normalized and start <= normalized[-1]:
+            merged_count += 1
+            if end > normalized[-1]:
+                normalized[-1] = end
         else:
-            raise IntervalOverlapException(name)
+            normalized.append(start)
+            normalized.append(end)
+    return normalized, merged_count
 
 
-def collect_lesson_intervals(
+def _walk_lesson_intervals(
     lesson: Sequence[int],
     pupil: Sequence[int],
-    tutor: Sequence[int]
-        ) -> List[Tuple[int]]:
+    tutor: Sequence[int],
+    counts: Optional[Dict[str, int]] = None
+        ) -> Iterator[Tuple[int, int]]:
     """
-    Поиск общих интервалов в массивах,
-    содержащих временные отрезки урока, присутствия ученика и учителя.
+    Общий двухуказательный обход массивов ученика и учителя.
 
     Значения массивов идут подряд в порядке возрастания.
     Четные элементы означают начало интервала, нечетные - конец.
 
-    Пересечения в рамках одного массива игнорируются.
-    """
+    Выдает общие интервалы, обрезанные по границам урока, кроме пустых
+    после обрезки и входящих в последний выданный интервал
+    (первый интервал сравнивается с (0, 0)).
 
+    Если передан словарь `counts`, после обхода в него записываются
+    счетчики: количество итераций цикла, выданных интервалов,
+    интервалов, пропущенных как пустые и как входящие
+    в последний выданный интервал.
+    """
     len_pupil = len(pupil)
     len_tutor = len(tutor)
     i = j = 0
-
-    result = [(0, 0)]
+    last_start = last_end = 0
+    iterations = intersections = skipped_empty = skipped_contained = 0
 
     while i < len_pupil and j < len_tutor:
+        iterations += 1
         # Проверяем, что интервалы пересекаются
         if pupil[i] <= tutor[j+1] and tutor[j] <= pupil[i+1]:
             start = max(pupil[i], tutor[j], lesson[0])
             end = min(pupil[i+1], tutor[j+1], lesson[1])
 
-        # Перед добавлением нового интервала, проверяем
-        # что он не входит в последний добавленный интервал.
-            last_added_interval = result[-1]
-            if not (
-                start >= last_added_interval[0]
-                and end <= last_added_interval[1]
-            ):
-                result.append((start, end))
+        # Перед выдачей нового интервала, проверяем, что он
+        # не пуст после обрезки по границам урока
+        # и не входит в последний выданный интервал.
+            if start >= end:
+                skipped_empty += 1
+            elif start >= last_start and end <= last_end:
+                skipped_contained += 1
+            else:
+                intersections += 1
+                last_start, last_end = start, end
+                yield start, end
             if pupil[i+1] > tutor[j+1]:    # Интервал Учителя закончился,
                 j += 2                     # => ищем следующий интервал Учителя
 
@@ -163,7 +206,28 @@ def collect_lesson_intervals(
         elif pupil[i] > tutor[j+1]:
             j += 2
 
-    return result
+    if counts is not None:
+        counts.update(
+            iterations=iterations,
+            intersections=intersections,
+            skipped_empty=skipped_empty,
+            skipped_contained=skipped_contained,
+        )
+
+
+def collect_lesson_intervals(
+    lesson: Sequence[int],
+    pupil: Sequence[int],
+    tutor: Sequence[int]
+        ) -> List[Tuple[int]]:
+    """
+    Поиск общих интервалов в массивах,
+    содержащих временные отрезки урока, присутствия ученика и учителя.
+
+    Результат начинается с интервала (0, 0).
+    Пересечения в рамках одного массива игнорируются.
+    """
+    return [(0, 0), *_walk_lesson_intervals(lesson, pupil, tutor)]
 
 
 def sum_intervals(intervals: List[Tuple[int]]):
@@ -173,11 +237,91 @@ def sum_intervals(intervals: List[Tuple[int]]):
     return sum(interval[1] - interval[0] for interval in intervals)
 
 
+class LessonIntervals:
+    """
+    Общие интервалы урока в плоских массивах `array('q')`:
+    начала и концы хранятся отдельно, без кортежа на каждый интервал.
+    """
+
+    def __init__(self) -> None:
+        self.starts = array('q')
+        self.ends = array('q')
+
+    def append(self, start: int, end: int) -> None:
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.starts, self.ends)
+
+    def total(self) -> int:
+        """ Сумма длительности всех интервалов. """
+        return sum(self.ends) - sum(self.starts)
+
+
+def collect_lesson_intervals_compact(
+    lesson: Sequence[int],
+    pupil: Sequence[int],
+    tutor: Sequence[int]
+        ) -> LessonIntervals:
+    """
+    То же, что `collect_lesson_intervals`, но результат хранится
+    в `LessonIntervals` и не содержит начального интервала (0, 0).
+    """
+    result = LessonIntervals()
+    for start, end in _walk_lesson_intervals(lesson, pupil, tutor):
+        result.append(start, end)
+    return result
+
+
+def sum_lesson_intervals(
+    lesson: Sequence[int],
+    pupil: Sequence[int],
+    tutor: Sequence[int]
+        ) -> int:
+    """
+    Продолжительность общих интервалов за один проход:
+    длительности суммируются по мере нахождения интервалов,
+    сами интервалы не сохраняются.
+    Результат совпадает с
+    `sum_intervals(collect_lesson_intervals(lesson, pupil, tutor))`.
+    """
+    return sum(
+        end - start
+        for start, end in _walk_lesson_intervals(lesson, pupil, tutor)
+    )
+
+
+def sum_lesson_intervals_counted(
+    lesson: Sequence[int],
+    pupil: Sequence[int],
+    tutor: Sequence[int]
+        ) -> Tuple[int, Dict[str, int]]:
+    """
+    То же, что `sum_lesson_intervals`, но дополнительно возвращает
+    счетчики обхода (см. `_walk_lesson_intervals`).
+
+    Используется только при включенных замерах (см. `instrumentation`),
+    чтобы не замедлять основной расчет.
+    """
+    counts = {}
+    total = sum(
+        end - start
+        for start, end in _walk_lesson_intervals(lesson, pupil, tutor, counts)
+    )
+    return total, counts
+
+
 def appearence(
     lesson: Sequence[int],
     pupil: Sequence[int],
     tutor: Sequence[int],
-    raise_overlap_exception: bool = True
+    raise_overlap_exception: bool = True,
+    normalize: bool = False,
+    report_merged: bool = False
         ) -> int:
     """
     Расчитывает продолжительность общих интервалов ученика и учителя.
@@ -191,14 +335,26 @@ def appearence(
     два варианта продолжения программы:
       - завершить выполнение;
       - продолжить выполнение (результаты могут отличаться от ожидаемых).
+
+    Флаг `normalize` отключает эту проверку: массивы `pupil` и `tutor`
+    сортируются, а пересекающиеся интервалы объединяются.
+    Флаг `report_merged` добавляет к результату количество
+    объединенных интервалов (только вместе с `normalize`).
+
+    При включенных замерах (см. `instrumentation`) время этапов
+    и счетчики обхода передаются в заданный приемник.
     """
+    measurement = instrumentation.start_measurement()
     try:
-        run_validation(
-            lesson,
-            pupil,
-            tutor,
-            raise_overlap_exception=raise_overlap_exception
-        )
+        with instrumentation.stage(measurement, 'run_validation'):
+            run_validation(
+                lesson,
+                pupil,
+                tutor,
+                raise_overlap_exception=(
+                    raise_overlap_exception and not normalize
+                )
+            )
     except (EmptyArrayException, OddArrayLengthException) as validation_error:
         sys.exit(f"Ошибка валидации: {validation_error}.\n")
     except IntervalOverlapException as overlap_error:
@@ -212,6 +368,22 @@ def appearence(
         if not proceed:
             sys.exit(0)
 
-    lesson_intervals = collect_lesson_intervals(lesson, pupil, tutor)
-    lesson_duration = sum_intervals(lesson_intervals)
-    return f'Длительность общих интервалов: {lesson_duration} секунд(ы, а).'
+    if normalize:
+        with instrumentation.stage(measurement, 'normalize_intervals'):
+            pupil, pupil_merged = normalize_intervals(pupil)
+            tutor, tutor_merged = normalize_intervals(tutor)
+
+    if measurement is None:
+        lesson_duration = sum_lesson_intervals(lesson, pupil, tutor)
+    else:
+        with measurement.stage('sum_lesson_intervals'):
+            lesson_duration, counts = sum_lesson_intervals_counted(
+                lesson, pupil, tutor
+            )
+        measurement.count(**counts)
+        instrumentation.finish_measurement(measurement)
+
+    result = f'Длительность общих интервалов: {lesson_duration} секунд(ы, а).'
+    if normalize and report_merged:
+        result += f' Объединено интервалов: {pupil_merged + tutor_merged}.'
+    return result
@@ -0,0 +1,130 @@
+"""
+Необязательные замеры этапов расчета функции `appearence`.
+
+По умолчанию замеры выключены, и `appearence` выполняет
+только одну проверку на вызов. После включения каждый вызов
+формирует `Measurement` со временем этапов (`run_validation`,
+`normalize_intervals`, `sum_lesson_intervals`) и счетчиками
+двухуказательного обхода, который передается в приемник (sink) -
+любой вызываемый объект:
+ - `LoggingSink` - запись в журнал `logging`;
+ - `StatsSink` - накопление суммарной статистики;
+ - произвольная функция обратного вызова.
+
+Пример:
+    stats = StatsSink()
+    with instrumented(stats):
+        appearence(lesson, pupil, tutor)
+    print(stats.stages, stats.counts)
+"""
+
+import logging
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from typing import Callable, Dict, Optional
+
+NULL_STAGE = nullcontext()
+
+
+class Measurement:
+    """ Время этапов и счетчики одного вызова `appearence`. """
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """ Измеряет время выполнения блока. """
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = (
+                self.stages.get(name, 0.0) + perf_counter() - started
+            )
+
+    def count(self, **counts: int) -> None:
+        for name, value in counts.items():
+            self.counts[name] = self.counts.get(name, 0) + value
+
+
+Sink = Callable[[Measurement], None]
+
+_sink: Optional[Sink] = None
+
+
+class LoggingSink:
+    """ Записывает каждый замер в журнал `logging`. """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        level: int = logging.DEBUG
+            ) -> None:
+        self.logger = logger or logging.getLogger('lesson_appearence')
+        self.level = level
+
+    def __call__(self, measurement: Measurement) -> None:
+        self.logger.log(
+            self.level,
+            'Этапы: %s; счетчики: %s',
+            ', '.join(
+                f'{name}={seconds * 1e6:.1f} мкс'
+                for name, seconds in measurement.stages.items()
+            ),
+            measurement.counts
+        )
+
+
+class StatsSink:
+    """ Накапливает суммарное время этапов и счетчики всех вызовов. """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.stages = Counter()
+        self.counts = Counter()
+
+    def __call__(self, measurement: Measurement) -> None:
+        self.calls += 1
+        self.stages.update(measurement.stages)
+        self.counts.update(measurement.counts)
+
+
+def enable(sink: Sink) -> None:
+    """ Включает замеры с передачей результатов в `sink`. """
+    global _sink
+    _sink = sink
+
+
+def disable() -> None:
+    """ Выключает замеры. """
+    enable(None)
+
+
+@contextmanager
+def instrumented(sink: Sink):
+    """ Включает замеры на время выполнения блока. """
+    previous_sink = _sink
+    enable(sink)
+    try:
+        yield sink
+    finally:
+        enable(previous_sink)
+
+
+def start_measurement() -> Optional[Measurement]:
+    """ Новый замер, если замеры включены, иначе None. """
+    return Measurement() if _sink is not None else None
+
+
+def stage(measurement: Optional[Measurement], name: str):
+    """ Замер этапа или пустой контекст, если замеры выключены. """
+    return NULL_STAGE if measurement is None else measurement.stage(name)
+
+
+def finish_measurement(measurement: Optional[Measurement]) -> None:
+    """ Передает завершенный замер в приемник. """
+    if measurement is not None and _sink is not None:
+        _sink(measurement)
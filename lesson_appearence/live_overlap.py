@@ -0,0 +1,131 @@
+"""
+Накопитель общего времени ученика и учителя на уроке
+по событиям входа и выхода, поступающим во время урока.
+
+События должны поступать в порядке времени. Каждое событие
+обрабатывается за O(1), а объем хранимых данных не зависит
+от продолжительности урока: хранятся только количество открытых
+подключений каждого участника, момент начала текущего общего
+интервала и накопленная сумма.
+
+Повторный вход участника, уже находящегося на уроке
+(пересекающиеся интервалы одного массива), не увеличивает
+общее время: результат - длительность пересечения объединений
+интервалов ученика и учителя.
+
+На частично пересекающихся интервалах одного массива результат
+расходится с `appearence`, двухуказательный обход которой может
+учесть общую часть повторно. Например, для pupil=[10, 30, 20, 40]
+и tutor=[0, 50] `appearence` возвращает 40, а накопитель - 30
+(как и `appearence(..., normalize=True)`).
+"""
+
+import heapq
+from typing import Iterator, Optional, Sequence, Tuple
+
+PARTICIPANTS = ('pupil', 'tutor')
+JOIN, LEAVE = 1, -1
+
+
+class LessonOverlapAccumulator:
+    """
+    Счетчик продолжительности общих интервалов в рамках урока,
+    обновляемый по мере поступления событий.
+    """
+
+    def __init__(self, lesson: Sequence[int]) -> None:
+        self.lesson_start, self.lesson_end = lesson
+        self._connections = dict.fromkeys(PARTICIPANTS, 0)
+        self._together_since: Optional[int] = None
+        self._last_time: Optional[int] = None
+        self._total = 0
+
+    def _clipped(self, start: int, end: int) -> int:
+        """ Длина отрезка [start, end] в пределах урока. """
+        return max(
+            min(end, self.lesson_end) - max(start, self.lesson_start), 0
+        )
+
+    def _check_time(self, time: int) -> None:
+        if self._last_time is not None and time < self._last_time:
+            raise ValueError(
+                f'События должны поступать по порядку: {time} < '
+                f'{self._last_time}'
+            )
+        self._last_time = time
+
+    def event(self, participant: str, kind: int, time: int) -> None:
+        """
+        Обрабатывает событие входа (JOIN) или выхода (LEAVE) участника.
+        """
+        if participant not in self._connections:
+            raise ValueError(f'Неизвестный участник: {participant!r}')
+        self._check_time(time)
+        was_together = self._together_since is not None
+        connections = self._connections[participant] + kind
+        if connections < 0:
+            raise ValueError(
+                f'Участник `{participant}` вышел, не входя на урок'
+            )
+        self._connections[participant] = connections
+
+        together = all(self._connections.values())
+        if together and not was_together:
+            self._together_since = time
+        elif was_together and not together:
+            self._total += self._clipped(self._together_since, time)
+            self._together_since = None
+
+    def join(self, participant: str, time: int) -> None:
+        """ Участник подключился к уроку. """
+        self.event(participant, JOIN, time)
+
+    def leave(self, participant: str, time: int) -> None:
+        """ Участник отключился от урока. """
+        self.event(participant, LEAVE, time)
+
+    def total(self, now: Optional[int] = None) -> int:
+        """
+        Общее время на момент `now` (по умолчанию - момент
+        последнего события), включая еще не завершенный общий интервал.
+        """
+        if now is None:
+            now = self._last_time
+        if self._together_since is None or now is None:
+            return self._total
+        return self._total + self._clipped(self._together_since, now)
+
+
+def iter_events(
+    pupil: Sequence[int],
+    tutor: Sequence[int]
+        ) -> Iterator[Tuple[int, int, str]]:
+    """
+    Преобразует массивы интервалов в упорядоченные по времени события
+    (время, вид события, участник). При равном времени выход
+    обрабатывается раньше входа.
+    """
+    def events(array, participant):
+        for i in range(0, len(array), 2):
+            yield array[i], JOIN, participant
+            yield array[i + 1], LEAVE, participant
+
+    return heapq.merge(
+        sorted(events(pupil, 'pupil')),
+        sorted(events(tutor, 'tutor'))
+    )
+
+
+def accumulate_arrays(
+    lesson: Sequence[int],
+    pupil: Sequence[int],
+    tutor: Sequence[int]
+        ) -> int:
+    """
+    Проигрывает массивы интервалов как поток событий
+    и возвращает итоговое общее время.
+    """
+    accumulator = LessonOverlapAccumulator(lesson)
+    for time, kind, participant in iter_events(pupil, tutor):
+        accumulator.event(participant, kind, time)
+    return accumulator.total()
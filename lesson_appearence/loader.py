@@ -0,0 +1,225 @@
+"""
+Потоковая загрузка журналов присутствия и расчет общего времени
+ученика и учителя для каждого урока.
+
+Входные данные - CSV с заголовком или JSON Lines. Каждая строка описывает
+один интервал: идентификатор урока, роль (`lesson`, `pupil` или `tutor`),
+начало и конец интервала:
+
+    lesson_id,role,start,end
+    1,lesson,1594663200,1594666800
+    1,pupil,1594663340,1594663389
+    1,tutor,1594663290,1594663430
+
+    {"lesson_id": 1, "role": "pupil", "start": 1594663340, "end": 1594663389}
+
+Строки одного урока должны идти подряд (журнал сгруппирован
+или отсортирован по идентификатору урока). В памяти одновременно
+находятся только уроки обрабатываемых частей, поэтому потребление памяти
+не зависит от размера журнала. Результаты (`lesson_id,duration`)
+записываются по мере расчета.
+
+Урок без интервалов ученика или учителя не прерывает обработку:
+его длительность равна 0, а идентификатор урока выводится
+в стандартный поток ошибок.
+
+Пример запуска:
+    (.../lesson_appearence$) python3 loader.py events.csv -o durations.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby, islice
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from batch import sum_lessons_chunk, to_columnar
+from find_lesson_intervals import IntervalsBaseException, normalize_intervals
+
+DEFAULT_CHUNK_SIZE = 10_000
+ROLES = ('lesson', 'pupil', 'tutor')
+
+Event = Tuple[str, str, int, int]
+Lesson = Tuple[str, List[int], List[int], List[int]]
+
+
+def iter_csv_events(file: TextIO) -> Iterator[Event]:
+    """ Читает интервалы из CSV с заголовком. """
+    for row in csv.DictReader(file):
+        yield row['lesson_id'], row['role'], int(row['start']), int(row['end'])
+
+
+def iter_jsonl_events(file: TextIO) -> Iterator[Event]:
+    """ Читает интервалы из JSON Lines, пропуская пустые строки. """
+    for line in file:
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        yield (
+            str(row['lesson_id']), row['role'],
+            int(row['start']), int(row['end'])
+        )
+
+
+EVENT_READERS = {
+    'csv': iter_csv_events,
+    'jsonl': iter_jsonl_events,
+}
+
+
+def iter_lessons(
+    events: Iterable[Event],
+    normalize: bool = False
+        ) -> Iterator[Lesson]:
+    """
+    Собирает подряд идущие интервалы одного урока
+    в массивы `lesson`, `pupil` и `tutor`.
+    Об уроках без интервалов ученика или учителя
+    сообщается в стандартный поток ошибок.
+    """
+    for lesson_id, lesson_events in groupby(events, key=lambda e: e[0]):
+        arrays = {role: [] for role in ROLES}
+        for _, role, start, end in lesson_events:
+            if role not in arrays:
+                raise ValueError(
+                    f'Урок {lesson_id}: неизвестная роль `{role}`'
+                )
+            arrays[role].append(start)
+            arrays[role].append(end)
+        if len(arrays['lesson']) != 2:
+            raise ValueError(
+                f'Урок {lesson_id}: должен быть указан ровно один '
+                'интервал урока'
+            )
+        for role in ('pupil', 'tutor'):
+            if not arrays[role]:
+                print(
+                    f'Урок {lesson_id}: нет интервалов `{role}`, '
+                    'длительность 0.',
+                    file=sys.stderr
+                )
+        if normalize:
+            arrays['pupil'], _ = normalize_intervals(arrays['pupil'])
+            arrays['tutor'], _ = normalize_intervals(arrays['tutor'])
+        yield lesson_id, arrays['lesson'], arrays['pupil'], arrays['tutor']
+
+
+def iter_chunks(
+    lessons: Iterator[Lesson],
+    chunk_size: int
+        ) -> Iterator[List[Lesson]]:
+    """ Делит поток уроков на части по `chunk_size` уроков. """
+    while chunk := list(islice(lessons, chunk_size)):
+        yield chunk
+
+
+def sum_chunk(chunk: List[Lesson]):
+    """
+    Идентификаторы уроков части и их длительности.
+    Массивы уже проверены в `iter_lessons`, а урок с пустым
+    массивом ученика или учителя получает длительность 0.
+    """
+    lesson_ids = [lesson_id for lesson_id, *_ in chunk]
+    durations = sum_lessons_chunk(
+        *to_columnar(arrays for _, *arrays in chunk), validate=False
+    )
+    return lesson_ids, durations.tolist()
+
+
+def compute_durations(
+    lessons: Iterable[Lesson],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = 1
+        ) -> Iterator[Tuple[str, int]]:
+    """
+    Рассчитывает длительности уроков по частям, сохраняя порядок.
+
+    При `workers` больше одного части обрабатываются на пуле процессов,
+    при этом одновременно в обработке находится не больше
+    `2 * workers` частей.
+    """
+    if chunk_size <= 0:
+        raise ValueError('Размер части должен быть положительным')
+    chunks = iter_chunks(iter(lessons), chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield from zip(*sum_chunk(chunk))
+        return
+
+    max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(executor.submit(sum_chunk, chunk))
+            if len(in_flight) >= max_in_flight:
+                yield from zip(*in_flight.popleft().result())
+        while in_flight:
+            yield from zip(*in_flight.popleft().result())
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Расчет общего времени ученика и учителя по журналу.'
+    )
+    parser.add_argument(
+        'input', nargs='?', default='-',
+        help='файл журнала (по умолчанию - стандартный ввод)'
+    )
+    parser.add_argument(
+        '-f', '--format', choices=EVENT_READERS,
+        help='формат журнала (по умолчанию - по расширению файла, иначе csv)'
+    )
+    parser.add_argument(
+        '-o', '--output', default='-',
+        help='файл результатов (по умолчанию - стандартный вывод)'
+    )
+    parser.add_argument(
+        '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+        help='количество уроков в одной части'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='количество процессов (0 - по числу ядер)'
+    )
+    parser.add_argument(
+        '--normalize', action='store_true',
+        help='сортировать и объединять пересекающиеся интервалы'
+    )
+    args = parser.parse_args(argv)
+
+    input_format = args.format or (
+        'jsonl' if args.input.endswith(('.jsonl', '.ndjson')) else 'csv'
+    )
+    input_file = (
+        sys.stdin if args.input == '-'
+        else open(args.input, newline='', encoding='utf-8')
+    )
+    output_file = (
+        sys.stdout if args.output == '-'
+        else open(args.output, 'w', newline='', encoding='utf-8')
+    )
+    try:
+        lessons = iter_lessons(
+            EVENT_READERS[input_format](input_file), args.normalize
+        )
+        writer = csv.writer(output_file)
+        writer.writerow(('lesson_id', 'duration'))
+        for lesson_id, duration in compute_durations(
+            lessons, args.chunk_size, args.workers or None
+        ):
+            writer.writerow((lesson_id, duration))
+    except (IntervalsBaseException, ValueError, KeyError) as error:
+        sys.exit(f'Ошибка обработки журнала: {error}.')
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
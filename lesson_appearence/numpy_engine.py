@@ -0,0 +1,69 @@
+"""
+Векторизованный расчет общего времени ученика и учителя на уроке.
+
+Вместо попарного обхода интервалов двумя указателями все границы
+интервалов объединяются и сортируются. Отрезок между соседними
+границами входит в результат, если в его начале присутствуют
+и ученик, и учитель, а сам отрезок лежит внутри урока.
+
+Присутствие в точке определяется через `searchsorted`:
+количество начавшихся интервалов минус количество закончившихся.
+Поэтому результат - длительность пересечения объединений интервалов
+ученика и учителя: пересекающиеся и вложенные интервалы одного
+массива учитываются один раз.
+
+На массивах без пересекающихся интервалов результат совпадает
+с `appearence`. На частично пересекающихся интервалах одного массива
+результаты расходятся: двухуказательный обход `appearence` может
+учесть общую часть повторно. Например, для pupil=[10, 30, 20, 40]
+и tutor=[0, 50] `appearence` возвращает 40, а эта реализация - 30.
+Чтобы получить тот же результат, что и здесь, используйте
+`appearence(..., normalize=True)`.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+
+def as_interval_bounds(array: Sequence[int]):
+    """
+    Разделяет плоский массив [начало, конец, ...]
+    на отсортированные массивы начал и концов интервалов.
+    """
+    array = np.asarray(array, dtype=np.int64)
+    return np.sort(array[0::2]), np.sort(array[1::2])
+
+
+def presence(starts: np.ndarray, ends: np.ndarray, points: np.ndarray):
+    """ Присутствует ли участник в каждой из точек. """
+    return (
+        np.searchsorted(starts, points, side='right')
+        > np.searchsorted(ends, points, side='right')
+    )
+
+
+def sum_lesson_intervals_numpy(
+    lesson: Sequence[int],
+    pupil: Sequence[int],
+    tutor: Sequence[int]
+        ) -> int:
+    """
+    Возвращает продолжительность общих интервалов ученика и учителя
+    в пределах урока. Принимает массивы `int64` или последовательности.
+    """
+    lesson_start, lesson_end = np.asarray(lesson, dtype=np.int64)[:2]
+    pupil_starts, pupil_ends = as_interval_bounds(pupil)
+    tutor_starts, tutor_ends = as_interval_bounds(tutor)
+
+    points = np.unique(np.concatenate((
+        pupil_starts, pupil_ends, tutor_starts, tutor_ends,
+        (lesson_start, lesson_end),
+    )))
+    points = points[(points >= lesson_start) & (points <= lesson_end)]
+    segment_starts = points[:-1]
+    together = (
+        presence(pupil_starts, pupil_ends, segment_starts)
+        & presence(tutor_starts, tutor_ends, segment_starts)
+    )
+    return int(np.diff(points)[together].sum())
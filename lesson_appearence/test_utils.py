@@ -35,3 +35,39 @@ def patched_appearence(
     lesson_intervals = collect_lesson_intervals(lesson, pupil, tutor)
     lesson_duration = sum_intervals(lesson_intervals)
     return f'Длительность общих интервалов: {lesson_duration} секунд(ы, а).'
+
+
+def make_test_arrays():
+    """ Наборы массивов, используемые в тестах. """
+    return {
+        'empty_pupil': {
+            'lesson': [0, 50],
+            'pupil': [],
+            'tutor': [20, 30, 40, 49]
+        },
+        'odd_length_tutor': {
+            'lesson': [0, 50],
+            'pupil': [10, 20, 25, 45],
+            'tutor': [20, 30, 40, 49, 50]
+        },
+        'overlapping_pupil': {
+            'lesson': [0, 50],
+            'pupil': [10, 20, 25, 45, 30, 35],
+            'tutor': [15, 30, 40, 49]
+        },
+        'valid_arrays': {
+            'lesson': [0, 100],
+            'pupil': [10, 20, 25, 45, 46, 50, 55, 80, 83, 89, 90, 99],
+            'tutor': [5, 30, 35, 70, 71, 88, 89, 105]
+        },
+        'very_short_lesson': {
+            'lesson': [0, 25],
+            'pupil': [10, 20, 25, 45],
+            'tutor': [15, 30, 40, 49]
+        },
+    }
+
+
+def parse_duration(result):
+    """ Извлекает число секунд из результата функции `appearence`. """
+    return int(result.split(': ')[1].split()[0])
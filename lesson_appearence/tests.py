@@ -1,9 +1,34 @@
 """ Тесты функции `appearence` модуля `lesson_appearence`. """
 
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
 import unittest
+from unittest import mock
 
-from find_lesson_intervals import appearence
-from test_utils import patched_appearence
+import numpy as np
+
+import benchmark
+from attendance_index import AttendanceIndex
+from batch import batch_appearence, batch_appearence_columnar
+from find_lesson_intervals import (
+    EmptyArrayException,
+    appearence,
+    collect_lesson_intervals,
+    collect_lesson_intervals_compact,
+    normalize_intervals,
+    sum_intervals,
+    sum_lesson_intervals
+)
+from group_overlap import sweep_attendance
+import instrumentation
+import loader
+from live_overlap import LessonOverlapAccumulator, accumulate_arrays
+from numpy_engine import sum_lesson_intervals_numpy
+from test_utils import make_test_arrays, parse_duration, patched_appearence
 
 
 class TestAppearence(unittest.TestCase):
@@ -152,5 +177,603 @@ class TestAppearence(unittest.TestCase):
         )
 
 
+class TestNormalize(unittest.TestCase):
+    """ Тесты неинтерактивного режима с объединением интервалов. """
+
+    def test_normalize_intervals(self):
+        cases = (
+            ([10, 20, 25, 45, 30, 35], [10, 20, 25, 45], 1),
+            ([30, 35, 10, 20, 25, 45], [10, 20, 25, 45], 1),
+            ([1, 10, 5, 7, 8, 12, 20, 30], [1, 12, 20, 30], 2),
+            ([1, 2, 2, 3], [1, 3], 1),
+            ([5, 6, 1, 2], [1, 2, 5, 6], 0),
+            ([], [], 0),
+        )
+        for array, expected_array, expected_merged in cases:
+            with self.subTest(array=array):
+                self.assertEqual(
+                    normalize_intervals(array),
+                    (expected_array, expected_merged),
+                    msg=(
+                        'Убедитесь, что интервалы сортируются, '
+                        'а пересекающиеся интервалы объединяются'
+                    )
+                )
+
+    def test_appearence_does_not_prompt(self):
+        """ В режиме `normalize` пользователь не опрашивается. """
+        arrays = make_test_arrays()['overlapping_pupil']
+        arrays['pupil'] = [30, 35, 25, 45, 10, 20]
+        with mock.patch(
+            'builtins.input',
+            side_effect=AssertionError('Вызван input()')
+        ):
+            result = appearence(**arrays, normalize=True)
+        self.assertEqual(
+            result,
+            'Длительность общих интервалов: 15 секунд(ы, а).'
+        )
+
+    def test_appearence_reports_merged(self):
+        """ Количество объединенных интервалов выводится по запросу. """
+        arrays = make_test_arrays()['overlapping_pupil']
+        arrays['pupil'] = [30, 35, 25, 45, 10, 20]
+        self.assertEqual(
+            appearence(**arrays, normalize=True, report_merged=True),
+            'Длительность общих интервалов: 15 секунд(ы, а). '
+            'Объединено интервалов: 1.'
+        )
+
+
+class TestCompactIntervals(unittest.TestCase):
+    """ Тесты компактного хранения общих интервалов. """
+
+    def test_same_intervals_without_sentinel(self):
+        arrays = make_test_arrays()
+        for name in ('overlapping_pupil', 'valid_arrays', 'very_short_lesson'):
+            case = arrays[name]
+            with self.subTest(name=name):
+                intervals = collect_lesson_intervals(**case)
+                compact = collect_lesson_intervals_compact(**case)
+                self.assertEqual(
+                    list(compact),
+                    intervals[1:],
+                    msg=(
+                        'Убедитесь, что компактный результат содержит '
+                        'те же интервалы без начального (0, 0)'
+                    )
+                )
+                self.assertEqual(len(compact), len(intervals) - 1)
+                self.assertEqual(compact.total(), sum_intervals(intervals))
+
+    def test_total_only_path(self):
+        arrays = make_test_arrays()
+        for name in ('overlapping_pupil', 'valid_arrays', 'very_short_lesson'):
+            case = arrays[name]
+            with self.subTest(name=name):
+                self.assertEqual(
+                    sum_lesson_intervals(**case),
+                    sum_intervals(collect_lesson_intervals(**case)),
+                    msg=(
+                        'Убедитесь, что расчет без сохранения интервалов '
+                        'возвращает ту же продолжительность'
+                    )
+                )
+
+
+class TestDifferentialFuzz(unittest.TestCase):
+    """ Сверка всех реализаций с посекундным эталоном. """
+
+    def test_engines_match_brute_force(self):
+        mismatches = benchmark.run_fuzz(cases=500, seed=17)
+        self.assertEqual(
+            mismatches,
+            [],
+            msg=(
+                'Убедитесь, что все реализации совпадают с эталонным '
+                'расчетом на случайных журналах'
+            )
+        )
+
+    def test_intervals_outside_lesson(self):
+        """ Пересечения за пределами урока не уменьшают результат. """
+        arrays = {
+            'lesson': [100, 200],
+            'pupil': [0, 50, 150, 250],
+            'tutor': [10, 40, 190, 300],
+        }
+        self.assertEqual(benchmark.brute_force_duration(**arrays), 10)
+        for engine in benchmark.ENGINES:
+            with self.subTest(engine=engine.name):
+                self.assertEqual(engine.compute(**arrays), 10)
+
+    def test_generated_log_shape(self):
+        generator = random.Random(3)
+        array = benchmark.generate_presence(generator, 1000, [0, 60_000])
+        self.assertEqual(len(array), 2000)
+        self.assertTrue(all(
+            array[i] < array[i + 1] < array[i + 2]
+            for i in range(0, len(array) - 2, 2)
+        ))
+
+    def test_benchmark_json_report(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'results.json')
+            with mock.patch('sys.stdout', new_callable=io.StringIO):
+                benchmark.main([
+                    'bench', '--max-power', '2', '--number', '1',
+                    '--json', path,
+                ])
+            with open(path) as file:
+                report = json.load(file)
+        self.assertEqual(
+            len(report['results']), 2 * len(benchmark.ENGINES)
+        )
+        for result in report['results']:
+            self.assertGreater(result['intervals_per_second'], 0)
+            self.assertIn('peak_memory_bytes', result)
+
+    def test_overlap_option(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'results.json')
+            with mock.patch('sys.stdout', new_callable=io.StringIO):
+                benchmark.main([
+                    'bench', '--max-power', '1', '--number', '1',
+                    '--overlap', '0.5', '--json', path,
+                ])
+                benchmark.main(['fuzz', '--cases', '50', '--overlap', '0.5'])
+            with open(path) as file:
+                report = json.load(file)
+        self.assertEqual(report['overlap'], 0.5)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """ Тесты замеров этапов функции `appearence`. """
+
+    def test_stats_sink(self):
+        stats = instrumentation.StatsSink()
+        with instrumentation.instrumented(stats):
+            result = appearence(
+                lesson=[0, 100],
+                pupil=[1, 10, 5, 7],
+                tutor=[0, 20],
+                raise_overlap_exception=False
+            )
+            appearence(
+                lesson=[100, 200],
+                pupil=[0, 50, 150, 250],
+                tutor=[10, 40, 190, 300]
+            )
+        self.assertEqual(
+            result, 'Длительность общих интервалов: 9 секунд(ы, а).'
+        )
+        self.assertEqual(stats.calls, 2)
+        self.assertEqual(
+            set(stats.stages),
+            {'run_validation', 'sum_lesson_intervals'}
+        )
+        self.assertEqual(
+            dict(stats.counts),
+            {
+                'iterations': 5,
+                'intersections': 2,
+                'skipped_empty': 1,
+                'skipped_contained': 1,
+            },
+            msg=(
+                'Убедитесь, что счетчики обхода учитывают итерации, '
+                'добавленные и пропущенные интервалы'
+            )
+        )
+
+    def test_callback_and_disable(self):
+        measurements = []
+        instrumentation.enable(measurements.append)
+        try:
+            appearence(**make_test_arrays()['valid_arrays'])
+        finally:
+            instrumentation.disable()
+        appearence(**make_test_arrays()['valid_arrays'])
+        self.assertEqual(len(measurements), 1)
+        self.assertEqual(measurements[0].counts['intersections'], 8)
+
+    def test_logging_sink(self):
+        with self.assertLogs('lesson_appearence', level='DEBUG') as logs:
+            with instrumentation.instrumented(instrumentation.LoggingSink()):
+                appearence(**make_test_arrays()['valid_arrays'])
+        self.assertIn('sum_lesson_intervals', logs.output[0])
+
+
+class TestNumpyEngine(unittest.TestCase):
+    """ Тесты векторизованного расчета общих интервалов. """
+
+    def setUp(self):
+        arrays = make_test_arrays()
+        self.cases = [
+            arrays['overlapping_pupil'],
+            arrays['valid_arrays'],
+            arrays['very_short_lesson'],
+        ]
+        return super().setUp()
+
+    def test_same_result_as_appearence(self):
+        for arrays in self.cases:
+            with self.subTest(**arrays):
+                self.assertEqual(
+                    sum_lesson_intervals_numpy(**arrays),
+                    parse_duration(
+                        appearence(**arrays, raise_overlap_exception=False)
+                    ),
+                    msg=(
+                        'Убедитесь, что векторизованный расчет возвращает '
+                        'ту же продолжительность, что и `appearence`'
+                    )
+                )
+
+    def test_int64_arrays(self):
+        arrays = {
+            name: np.array(array, dtype=np.int64)
+            for name, array in make_test_arrays()['valid_arrays'].items()
+        }
+        self.assertEqual(sum_lesson_intervals_numpy(**arrays), 67)
+
+    def test_intervals_outside_lesson(self):
+        """ Общие интервалы за пределами урока не учитываются. """
+        self.assertEqual(
+            sum_lesson_intervals_numpy(
+                lesson=[100, 200],
+                pupil=[0, 50, 150, 250],
+                tutor=[10, 40, 190, 300]
+            ),
+            10
+        )
+
+
+class TestBatchAppearence(unittest.TestCase):
+    """ Тесты пакетного расчета для множества уроков. """
+
+    def setUp(self):
+        arrays = make_test_arrays()
+        self.lessons = [
+            (case['lesson'], case['pupil'], case['tutor'])
+            for case in (
+                arrays['overlapping_pupil'],
+                arrays['valid_arrays'],
+                arrays['very_short_lesson'],
+            )
+        ] * 5
+        self.expected = [
+            parse_duration(appearence(*lesson, raise_overlap_exception=False))
+            for lesson in self.lessons
+        ]
+        return super().setUp()
+
+    def test_same_result_as_appearence(self):
+        for workers, chunk_size in ((1, 4), (2, 4), (None, 1000)):
+            with self.subTest(workers=workers, chunk_size=chunk_size):
+                durations = batch_appearence(
+                    self.lessons, workers=workers, chunk_size=chunk_size
+                )
+                self.assertEqual(durations.dtype, np.int64)
+                self.assertEqual(
+                    durations.tolist(),
+                    self.expected,
+                    msg=(
+                        'Убедитесь, что пакетный расчет возвращает те же '
+                        'значения, что и `appearence`'
+                    )
+                )
+
+    def test_columnar_layout(self):
+        durations = batch_appearence_columnar(
+            lessons=[0, 50, 0, 25],
+            pupil_values=[10, 20, 25, 45, 10, 20, 25, 45],
+            pupil_offsets=[0, 4, 8],
+            tutor_values=[15, 30, 40, 49, 15, 30, 40, 49],
+            tutor_offsets=[0, 4, 8],
+            workers=2,
+            chunk_size=1
+        )
+        self.assertEqual(durations.tolist(), [15, 5])
+
+    def test_validation_error_is_raised(self):
+        """ Ошибки валидации не завершают процесс. """
+        lessons = self.lessons + [([0, 50], [], [20, 30])]
+        with self.assertRaises(EmptyArrayException) as error_info:
+            batch_appearence(lessons, workers=2, chunk_size=4)
+        self.assertEqual(error_info.exception.array_name, 'pupil')
+
+    def test_empty_batch(self):
+        self.assertEqual(batch_appearence([]).shape, (0,))
+
+
+class TestLessonOverlapAccumulator(unittest.TestCase):
+    """ Тесты накопителя общего времени по событиям. """
+
+    def test_same_result_as_appearence(self):
+        arrays = make_test_arrays()
+        for name in ('overlapping_pupil', 'valid_arrays', 'very_short_lesson'):
+            with self.subTest(name=name):
+                self.assertEqual(
+                    accumulate_arrays(**arrays[name]),
+                    parse_duration(appearence(
+                        **arrays[name], raise_overlap_exception=False
+                    )),
+                    msg=(
+                        'Убедитесь, что итоговое значение накопителя '
+                        'совпадает с результатом `appearence`'
+                    )
+                )
+
+    def test_running_total(self):
+        """ Текущее значение доступно в любой момент урока. """
+        accumulator = LessonOverlapAccumulator([0, 100])
+        accumulator.join('tutor', 5)
+        self.assertEqual(accumulator.total(), 0)
+        accumulator.join('pupil', 10)
+        self.assertEqual(accumulator.total(15), 5)
+        accumulator.leave('pupil', 20)
+        self.assertEqual(accumulator.total(50), 10)
+        accumulator.join('pupil', 90)
+        self.assertEqual(accumulator.total(120), 20)
+
+    def test_events_out_of_order(self):
+        accumulator = LessonOverlapAccumulator([0, 100])
+        accumulator.join('pupil', 10)
+        with self.assertRaises(ValueError):
+            accumulator.join('tutor', 5)
+
+    def test_leave_without_join(self):
+        accumulator = LessonOverlapAccumulator([0, 100])
+        with self.assertRaises(ValueError):
+            accumulator.leave('pupil', 10)
+
+
+class TestGroupAttendance(unittest.TestCase):
+    """ Тесты расчета присутствия произвольного числа участников. """
+
+    @staticmethod
+    def random_intervals(generator, count):
+        return sorted(generator.sample(range(0, 200), 2 * count))
+
+    @staticmethod
+    def brute_force_histogram(lesson, participants):
+        """ Посекундный подсчет присутствующих участников. """
+        histogram = [0] * (len(participants) + 1)
+        for second in range(lesson[0], lesson[1]):
+            present = sum(
+                any(
+                    array[i] <= second < array[i + 1]
+                    for i in range(0, len(array), 2)
+                )
+                for array in participants
+            )
+            histogram[present] += 1
+        return histogram
+
+    def test_two_participants_same_as_appearence(self):
+        arrays = make_test_arrays()
+        for name in ('overlapping_pupil', 'valid_arrays', 'very_short_lesson'):
+            case = arrays[name]
+            with self.subTest(name=name):
+                summary = sweep_attendance(
+                    case['lesson'], [case['pupil'], case['tutor']]
+                )
+                self.assertEqual(
+                    summary.all_present,
+                    parse_duration(
+                        appearence(**case, raise_overlap_exception=False)
+                    ),
+                    msg=(
+                        'Убедитесь, что время присутствия всех участников '
+                        'совпадает с результатом `appearence`'
+                    )
+                )
+
+    def test_overlapping_intervals_union(self):
+        """ Пересекающиеся интервалы одного участника - объединение. """
+        lesson, pupil, tutor = [0, 50], [10, 30, 20, 40], [0, 50]
+        summary = sweep_attendance(lesson, [pupil, tutor])
+        self.assertEqual(summary.all_present, 30)
+        self.assertEqual(
+            summary.all_present,
+            parse_duration(appearence(lesson, pupil, tutor, normalize=True))
+        )
+
+    def test_histogram_against_brute_force(self):
+        generator = random.Random(12)
+        for _ in range(50):
+            lesson = sorted(generator.sample(range(0, 200), 2))
+            participants = [
+                self.random_intervals(generator, generator.randint(1, 6))
+                for _ in range(generator.randint(1, 8))
+            ]
+            expected = self.brute_force_histogram(lesson, participants)
+            at_least = generator.randint(0, len(participants))
+            with self.subTest(lesson=lesson, participants=participants):
+                summary = sweep_attendance(lesson, participants, at_least)
+                self.assertEqual(summary.histogram, expected)
+                self.assertEqual(summary.all_present, expected[-1])
+                self.assertEqual(summary.at_least, sum(expected[at_least:]))
+
+    def test_invalid_at_least(self):
+        with self.assertRaises(ValueError):
+            sweep_attendance([0, 10], [[1, 2]], at_least=2)
+
+
+class TestAttendanceIndex(unittest.TestCase):
+    """ Тесты индекса для многократных запросов по окнам. """
+
+    def test_same_result_as_appearence(self):
+        arrays = make_test_arrays()
+        for name in ('overlapping_pupil', 'valid_arrays', 'very_short_lesson'):
+            case = arrays[name]
+            with self.subTest(name=name):
+                index = AttendanceIndex(case['pupil'], case['tutor'])
+                self.assertEqual(
+                    index.query_lesson(case['lesson']),
+                    parse_duration(
+                        appearence(**case, raise_overlap_exception=False)
+                    ),
+                    msg=(
+                        'Убедитесь, что запрос по окну урока совпадает '
+                        'с результатом `appearence`'
+                    )
+                )
+
+    def test_overlapping_intervals_union(self):
+        """ Пересекающиеся интервалы одного массива - объединение. """
+        lesson, pupil, tutor = [0, 50], [10, 30, 20, 40], [0, 50]
+        index = AttendanceIndex(pupil, tutor)
+        self.assertEqual(index.query_lesson(lesson), 30)
+        self.assertEqual(
+            index.query_lesson(lesson),
+            parse_duration(appearence(lesson, pupil, tutor, normalize=True))
+        )
+
+    def test_random_windows(self):
+        """ Запросы по случайным окнам сверяются с полным пересчетом. """
+        generator = random.Random(14)
+        pupil = sorted(generator.sample(range(0, 10_000), 400))
+        tutor = sorted(generator.sample(range(0, 10_000), 300))
+        index = AttendanceIndex(pupil, tutor)
+        for _ in range(200):
+            window = sorted(generator.sample(range(-100, 10_100), 2))
+            with self.subTest(window=window):
+                self.assertEqual(
+                    index.query(*window),
+                    sum_lesson_intervals_numpy(window, pupil, tutor)
+                )
+
+    def test_inverted_window(self):
+        """ Перевернутое окно не дает отрицательной продолжительности. """
+        index = AttendanceIndex([0, 100], [0, 100])
+        self.assertEqual(index.query(50, 40), 0)
+        self.assertEqual(index.query(50, 50), 0)
+        self.assertEqual(
+            index.query_lesson([50, 40]),
+            sum_lesson_intervals([50, 40], [0, 100], [0, 100])
+        )
+
+    def test_windows_add_up(self):
+        """ Сумма по соседним окнам равна значению по их объединению. """
+        index = AttendanceIndex(
+            make_test_arrays()['valid_arrays']['pupil'],
+            make_test_arrays()['valid_arrays']['tutor']
+        )
+        self.assertEqual(
+            sum(index.query(hour, hour + 10) for hour in range(0, 100, 10)),
+            index.query(0, 100)
+        )
+
+
+class TestLoader(unittest.TestCase):
+    """ Тесты потоковой загрузки журналов присутствия. """
+
+    def setUp(self):
+        arrays = make_test_arrays()
+        self.lessons = {
+            str(lesson_id): arrays[name]
+            for lesson_id, name in enumerate(
+                ('valid_arrays', 'very_short_lesson', 'valid_arrays') * 3
+            )
+        }
+        self.expected = ['lesson_id,duration'] + [
+            f'{lesson_id},{parse_duration(appearence(**case))}'
+            for lesson_id, case in self.lessons.items()
+        ]
+        self.temp_dir = tempfile.TemporaryDirectory()
+        return super().setUp()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        return super().tearDown()
+
+    def iter_rows(self):
+        for lesson_id, case in self.lessons.items():
+            for role in ('lesson', 'pupil', 'tutor'):
+                array = case[role]
+                for i in range(0, len(array), 2):
+                    yield {
+                        'lesson_id': lesson_id,
+                        'role': role,
+                        'start': array[i],
+                        'end': array[i + 1],
+                    }
+
+    def write_csv(self):
+        path = os.path.join(self.temp_dir.name, 'events.csv')
+        with open(path, 'w', newline='') as file:
+            file.write('lesson_id,role,start,end\n')
+            for row in self.iter_rows():
+                file.write('{lesson_id},{role},{start},{end}\n'.format(**row))
+        return path
+
+    def write_jsonl(self):
+        path = os.path.join(self.temp_dir.name, 'events.jsonl')
+        with open(path, 'w') as file:
+            for row in self.iter_rows():
+                file.write(json.dumps(row) + '\n')
+        return path
+
+    def run_loader(self, *argv):
+        output = os.path.join(self.temp_dir.name, 'durations.csv')
+        loader.main([*argv, '-o', output])
+        with open(output) as file:
+            return file.read().splitlines()
+
+    def test_csv_and_jsonl(self):
+        for path in (self.write_csv(), self.write_jsonl()):
+            for workers in ('1', '2'):
+                with self.subTest(path=path, workers=workers):
+                    self.assertEqual(
+                        self.run_loader(
+                            path, '--chunk-size', '2', '--workers', workers
+                        ),
+                        self.expected,
+                        msg=(
+                            'Убедитесь, что загрузчик рассчитывает '
+                            'длительности всех уроков в исходном порядке'
+                        )
+                    )
+
+    def test_lazy_reading(self):
+        """ Журнал читается по мере расчета, а не целиком. """
+        events = loader.iter_csv_events(io.StringIO(
+            'lesson_id,role,start,end\n'
+            '1,lesson,0,10\n1,pupil,0,5\n1,tutor,2,10\n'
+            '2,lesson,0,10\n2,unknown,0,5\n'
+        ))
+        durations = loader.compute_durations(
+            loader.iter_lessons(events), chunk_size=1
+        )
+        self.assertEqual(next(durations), ('1', 3))
+        with self.assertRaises(ValueError):
+            next(durations)
+
+    def test_invalid_log_exits_with_message(self):
+        path = os.path.join(self.temp_dir.name, 'bad.csv')
+        with open(path, 'w') as file:
+            file.write('lesson_id,role,start,end\n1,pupil,0,5\n')
+        with self.assertRaises(SystemExit) as exit_info:
+            self.run_loader(path)
+        self.assertIn('Урок 1', exit_info.exception.code)
+
+    def test_lesson_without_pupil(self):
+        """ Урок без интервалов ученика не прерывает обработку. """
+        path = os.path.join(self.temp_dir.name, 'partial.csv')
+        with open(path, 'w') as file:
+            file.write(
+                'lesson_id,role,start,end\n'
+                '1,lesson,0,10\n1,pupil,0,5\n1,tutor,2,10\n'
+                '2,lesson,0,10\n2,tutor,0,10\n'
+                '3,lesson,0,10\n3,pupil,0,10\n3,tutor,5,10\n'
+            )
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            rows = self.run_loader(path, '--chunk-size', '2')
+        self.assertEqual(rows, ['lesson_id,duration', '1,3', '2,0', '3,5'])
+        self.assertIn('Урок 2', stderr.getvalue())
+
+
 if __name__ == '__main__':
     unittest.main()
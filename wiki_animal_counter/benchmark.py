@@ -0,0 +1,174 @@
+"""
+Замеры времени и памяти разбора страницы категории
+для реализаций из `page_parser`.
+
+По умолчанию разбирается сгенерированная страница, похожая
+на страницу категории Википедии: 200 названий под несколькими
+буквами и объемная разметка навигации вокруг блока `div#mw-pages`.
+Сохраненную страницу можно передать через `--file`.
+Результаты выводятся таблицей и, при указании `--json`,
+сохраняются в машиночитаемом виде.
+
+Пример запуска:
+    (.../wiki_animal_counter$) python3 benchmark.py --items 200
+    (.../wiki_animal_counter$) python3 benchmark.py --file page.html
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from page_parser import CATEGORY_TITLE, PARSERS
+
+LETTERS = 'АБВГДЕЖЗИКЛМНОПРСТУФХЦЧШЭЮЯ'
+
+
+def generate_page(items: int = 200, padding: int = 2000) -> str:
+    """
+    Страница категории с `items` названиями и `padding` элементами
+    разметки вне блока `div#mw-pages` (меню, подвал, скрипты).
+    """
+    filler = ''.join(
+        f'<li id="n-{i}" class="mw-list-item"><a href="/wiki/{i}" '
+        f'title="Служебная ссылка {i}"><span>Пункт меню {i}</span></a></li>'
+        for i in range(padding)
+    )
+    per_letter = max(items // len(LETTERS), 1)
+    groups = []
+    for position in range(0, items, per_letter):
+        letter = LETTERS[position // per_letter % len(LETTERS)]
+        names = ''.join(
+            f'<li><a href="/wiki/{letter}{i}" title="{letter}{i}">'
+            f'{letter}ивотное {i}</a></li>'
+            for i in range(position, min(position + per_letter, items))
+        )
+        groups.append(
+            f'<div class="mw-category-group"><h3>{letter}</h3>'
+            f'<ul>{names}</ul></div>'
+        )
+    links = (
+        f'(<a href="/w/index.php?pagefrom=1" title="{CATEGORY_TITLE}">'
+        f'Предыдущая страница</a>) '
+        f'(<a href="/w/index.php?pagefrom=2" title="{CATEGORY_TITLE}">'
+        f'Следующая страница</a>)'
+    )
+    return (
+        '<!DOCTYPE html><html><head><title>Категория</title>'
+        + '<script>var config = {};</script>' * 20
+        + '</head><body>'
+        + f'<div id="mw-navigation"><ul>{filler}</ul></div>'
+        + '<div id="mw-content-text"><div id="mw-pages">'
+        + f'<h2>Страницы в категории</h2>{links}'
+        + '<div lang="ru" dir="ltr" class="mw-content-ltr">'
+        + f'<div class="mw-category mw-category-columns">{"".join(groups)}'
+        + f'</div></div>{links}</div></div>'
+        + f'<div id="footer"><ul>{filler}</ul></div>'
+        + '</body></html>'
+    )
+
+
+def measure(parser: str, contents: str, number: Optional[int] = None):
+    """
+    Время одного разбора и пиковая память Python-аллокаций.
+    Память, выделяемая библиотекой libxml2, в замер не входит.
+    """
+    parse = PARSERS[parser]
+    timer = timeit.Timer(lambda: parse(contents))
+    if number is None:
+        number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat=3, number=number)) / number
+
+    tracemalloc.start()
+    parse(contents)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': seconds, 'peak_memory_bytes': peak_memory}
+
+
+def run_benchmark(
+    contents: str,
+    parsers=tuple(PARSERS),
+    number: Optional[int] = None
+        ) -> List[Dict]:
+    """ Выполняет замеры для всех реализаций разбора. """
+    results = []
+    for parser in parsers:
+        results.append({
+            'parser': parser,
+            'page_bytes': len(contents.encode()),
+            **measure(parser, contents, number),
+        })
+    return results
+
+
+def format_table(results: List[Dict]) -> str:
+    """ Форматирует результаты в текстовую таблицу. """
+    header = (
+        f'{"реализация":<10} {"страница, Б":>12} '
+        f'{"время, мс":>10} {"память, Б":>12}'
+    )
+    rows = [header, '-' * len(header)]
+    for result in results:
+        rows.append(
+            f'{result["parser"]:<10} {result["page_bytes"]:>12} '
+            f'{result["seconds"] * 1000:>10.2f} '
+            f'{result["peak_memory_bytes"]:>12}'
+        )
+    return '\n'.join(rows)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--file', help='сохраненная страница категории (HTML)'
+    )
+    parser.add_argument(
+        '--items', type=int, default=200,
+        help='количество названий на сгенерированной странице'
+    )
+    parser.add_argument(
+        '--padding', type=int, default=2000,
+        help='количество элементов разметки вне списка названий'
+    )
+    parser.add_argument(
+        '--parser', action='append', choices=PARSERS,
+        help='ограничить замеры указанными реализациями'
+    )
+    parser.add_argument(
+        '--number', type=int,
+        help='количество вызовов в замере (по умолчанию подбирается)'
+    )
+    parser.add_argument('--json', help='путь к файлу для сохранения JSON')
+    args = parser.parse_args(argv)
+
+    if args.file:
+        with open(args.file, encoding='utf-8') as file:
+            contents = file.read()
+    else:
+        contents = generate_page(args.items, args.padding)
+    results = run_benchmark(contents, args.parser or PARSERS, args.number)
+    print(format_table(results))
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(
+                {
+                    'environment': {
+                        'python': platform.python_version(),
+                        'platform': platform.platform(),
+                        'timestamp': datetime.now(timezone.utc).isoformat(),
+                    },
+                    'results': results,
+                },
+                file,
+                ensure_ascii=False,
+                indent=2
+            )
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,80 @@
+"""
+Контрольные точки обхода страниц категории.
+
+Состояние `Счетчика` после каждой обработанной страницы
+(количество названий по буквам, текущая буква и ссылка на следующую
+страницу) периодически сохраняется в JSON файл. Запись атомарная:
+данные пишутся во временный файл в том же каталоге, который затем
+заменяет файл контрольной точки, поэтому при сбое во время записи
+остается предыдущая целая контрольная точка.
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(
+    path: str,
+    base_url: str,
+    counter: Dict[str, int],
+    letter: str,
+    url: str,
+    pages: int
+        ) -> None:
+    """
+    Сохраняет состояние обхода: `counter` содержит результаты
+    всех страниц до `url`, обход продолжается со страницы `url`.
+    """
+    data = {
+        'version': CHECKPOINT_VERSION,
+        'base_url': base_url,
+        'counter': dict(counter),
+        'letter': letter,
+        'url': url,
+        'pages': pages,
+        'saved_at': time.time(),
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=directory, suffix='.tmp'
+    )
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def load_checkpoint(path: str, base_url: str) -> Optional[Dict]:
+    """
+    Состояние обхода из контрольной точки или None, если файла нет,
+    он поврежден или относится к обходу другой категории.
+    """
+    try:
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if (
+        data.get('version') != CHECKPOINT_VERSION
+        or data.get('base_url') != base_url
+    ):
+        return None
+    return data
+
+
+def remove_checkpoint(path: str) -> None:
+    """ Удаляет контрольную точку после завершения обхода. """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
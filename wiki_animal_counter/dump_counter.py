@@ -0,0 +1,269 @@
+"""
+Подсчет количества названий животных по локальному дампу Википедии
+без обращения к сайту.
+
+Поддерживаемые дампы (без сжатия или в архивах `.gz`/`.bz2`):
+ - SQL дамп таблицы `categorylinks`
+   (ruwiki-latest-categorylinks.sql.gz): строки таблицы с категорией
+   `Животные_по_алфавиту` и типом `page`. Буква - первый символ
+   ключа сортировки `cl_sortkey` (сортировка `uppercase`);
+ - XML дамп страниц (ruwiki-latest-pages-articles.xml.bz2): статьи,
+   в тексте которых есть ссылка на категорию. Буква - первый символ
+   ключа сортировки ссылки, `{{DEFAULTSORT:...}}` или названия статьи.
+
+Поддерживаемый источник - SQL дамп `categorylinks`: в нем есть
+все страницы категории. XML дамп содержит исходный текст статей,
+в котором видны только явные ссылки `[[Категория:...]]`. Категории,
+добавляемые шаблонами (например, карточкой таксона), в тексте
+не раскрыты, поэтому такие статьи при разборе XML не учитываются,
+и результат занижен.
+
+Дамп распаковывается и читается потоково: в памяти находится
+одна строка SQL дампа (одна команда INSERT) или одна страница XML дампа.
+
+Пример запуска:
+    (.../wiki_animal_counter$) python3 dump_counter.py \\
+        ruwiki-latest-categorylinks.sql.gz
+"""
+
+import bz2
+import gzip
+import re
+import sys
+import xml.etree.ElementTree as ElementTree
+from typing import Dict, Iterator, List, Optional
+
+from wiki_animal_counter import WikiAnimalNameCounter
+
+CATEGORY_NAME = 'Животные по алфавиту'
+CATEGORYLINKS_COLUMNS = (
+    'cl_from',
+    'cl_to',
+    'cl_sortkey',
+    'cl_timestamp',
+    'cl_sortkey_prefix',
+    'cl_collation',
+    'cl_type',
+)
+COLUMN_PATTERN = re.compile(r'^\s*`(\w+)`')
+CREATE_TABLE_PATTERN = re.compile(r'CREATE TABLE `(\w+)`')
+DEFAULTSORT_PATTERN = re.compile(
+    r'\{\{\s*(?:DEFAULTSORT|СОРТИРОВКА_ПО_УМОЛЧАНИЮ|СОРТИРОВКА)\s*:'
+    r'\s*([^}]*?)\s*\}\}'
+)
+ESCAPE_PATTERN = re.compile(r'\\(.)', re.DOTALL)
+ESCAPES = {'0': '\0', 'b': '\b', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+ROW_PATTERN = re.compile(r"\(((?:'(?:[^'\\]|\\.)*'|[^'()])*)\)", re.DOTALL)
+VALUE_PATTERN = re.compile(r"'((?:[^'\\]|\\.)*)'|([^,']+)", re.DOTALL)
+
+
+def open_dump(path: str, mode: str = 'rt'):
+    """
+    Открывает дамп с потоковой распаковкой по расширению файла:
+    `.gz` - gzip, `.bz2` - bzip2, иначе файл без сжатия.
+    """
+    if path.endswith('.gz'):
+        opener = gzip.open
+    elif path.endswith('.bz2'):
+        opener = bz2.open
+    else:
+        opener = open
+    if 'b' in mode:
+        return opener(path, mode)
+    return opener(path, mode, encoding='utf-8', errors='replace')
+
+
+def detect_dump_format(path: str) -> str:
+    """ Формат дампа (`sql` или `xml`) по имени файла. """
+    name = path.lower()
+    if '.sql' in name:
+        return 'sql'
+    if '.xml' in name:
+        return 'xml'
+    raise ValueError(
+        f'Не удалось определить формат дампа {path}. '
+        'Ожидается файл .sql или .xml (в том числе .gz и .bz2).'
+    )
+
+
+def _unescape(value: str) -> str:
+    """ Значение строки SQL без экранирования MySQL. """
+    return ESCAPE_PATTERN.sub(
+        lambda match: ESCAPES.get(match.group(1), match.group(1)), value
+    )
+
+
+def parse_values(row: str) -> List[Optional[str]]:
+    """ Значения одной строки `(...)` команды INSERT. """
+    values = []
+    for match in VALUE_PATTERN.finditer(row):
+        quoted, plain = match.groups()
+        if quoted is not None:
+            values.append(_unescape(quoted))
+        else:
+            plain = plain.strip()
+            values.append(None if plain == 'NULL' else plain)
+    return values
+
+
+def iter_sql_rows(
+    lines,
+    table: str,
+    needle: Optional[str] = None
+        ) -> Iterator[Dict[str, Optional[str]]]:
+    """
+    Строки таблицы `table` из команд INSERT SQL дампа в виде словарей
+    {столбец: значение}. Порядок столбцов берется из CREATE TABLE,
+    а при его отсутствии - стандартный порядок `categorylinks`.
+    Команды, в которых нет подстроки `needle`, не разбираются.
+    """
+    columns = list(CATEGORYLINKS_COLUMNS)
+    insert_prefix = f'INSERT INTO `{table}` VALUES '
+    table_columns = None
+    for line in lines:
+        if table_columns is not None:
+            match = COLUMN_PATTERN.match(line)
+            if match:
+                table_columns.append(match.group(1))
+                continue
+            if table_columns:
+                columns = table_columns
+            table_columns = None
+
+        if line.startswith('CREATE TABLE'):
+            match = CREATE_TABLE_PATTERN.match(line)
+            if match and match.group(1) == table:
+                table_columns = []
+            continue
+        if not line.startswith(insert_prefix):
+            continue
+        if needle is not None and needle not in line:
+            continue
+        for row in ROW_PATTERN.finditer(line, len(insert_prefix)):
+            yield dict(zip(columns, parse_values(row.group(1))))
+
+
+def iter_categorylinks_sortkeys(
+    lines,
+    category: str = CATEGORY_NAME
+        ) -> Iterator[str]:
+    """ Ключи сортировки страниц (`cl_type` = page) категории. """
+    category = category.replace(' ', '_')
+    needle = f"'{category}'"
+    for row in iter_sql_rows(lines, 'categorylinks', needle):
+        if row.get('cl_to') == category and row.get('cl_type') == 'page':
+            yield row['cl_sortkey']
+
+
+def _local_name(tag: str) -> str:
+    """ Имя элемента XML без пространства имен. """
+    return tag.rsplit('}', 1)[-1]
+
+
+def _category_link_pattern(category: str):
+    words = r'[ _]+'.join(re.escape(word) for word in category.split())
+    return re.compile(
+        r'\[\[\s*(?:Категория|Category)\s*:\s*' + words
+        + r'\s*(?:\|([^\]]*))?\]\]',
+        re.IGNORECASE
+    )
+
+
+def iter_xml_sortkeys(
+    stream,
+    category: str = CATEGORY_NAME
+        ) -> Iterator[str]:
+    """
+    Ключи сортировки статей (пространство имен 0), которые ссылаются
+    на категорию. `stream` - двоичный поток XML дампа.
+    """
+    link_pattern = _category_link_pattern(category)
+    page = {}
+    root = None
+    for event, element in ElementTree.iterparse(
+        stream, events=('start', 'end')
+    ):
+        if root is None:
+            root = element
+        if event == 'start':
+            continue
+        name = _local_name(element.tag)
+        if name in ('title', 'ns', 'text'):
+            page.setdefault(name, element.text or '')
+            continue
+        if name != 'page':
+            continue
+
+        text = page.get('text', '')
+        match = link_pattern.search(text) if page.get('ns') == '0' else None
+        if match:
+            sortkey = (match.group(1) or '').strip()
+            if not sortkey:
+                default_sort = DEFAULTSORT_PATTERN.search(text)
+                sortkey = (
+                    default_sort.group(1) if default_sort
+                    else page.get('title', '')
+                )
+            yield sortkey
+        page = {}
+        #  Страница обработана: освобождаем память.
+        root.clear()
+
+
+class DumpAnimalNameCounter(WikiAnimalNameCounter):
+    """
+    `Счетчик`, заполняемый по локальному дампу Википедии
+    вместо обхода страниц сайта.
+    """
+    #  Дамп читается за один проход без обращения к сети,
+    #  контрольные точки обхода страниц к нему неприменимы.
+    SUPPORTS_CHECKPOINTS = False
+
+    def __init__(
+        self,
+        dump_path: str,
+        dump_format: Optional[str] = None,
+        **options
+            ) -> None:
+        """
+        `dump_path` - путь к дампу, `dump_format` - `sql` или `xml`
+        (по умолчанию определяется по имени файла).
+        """
+        super().__init__(**options)
+        self.dump_path = dump_path
+        self.dump_format = dump_format or detect_dump_format(dump_path)
+        if self.dump_format not in ('sql', 'xml'):
+            raise ValueError(f'Неизвестный формат дампа: {self.dump_format}')
+
+    def _count_letters(self):
+        """
+        Подсчитывает количество названий животных
+        с группировкой по буквам русского алфавита.
+        """
+        print(f'Обрабатываю дамп {self.dump_path}')
+        for sortkey in self._iter_sortkeys():
+            if not sortkey:
+                continue
+            letter = sortkey[0].upper()
+            #  Как и при обходе сайта, учитываются только
+            #  названия на русском языке.
+            if letter.isascii():
+                continue
+            self._counter[letter] += 1
+
+    def _iter_sortkeys(self) -> Iterator[str]:
+        if self.dump_format == 'sql':
+            with open_dump(self.dump_path) as lines:
+                yield from iter_categorylinks_sortkeys(lines)
+        else:
+            with open_dump(self.dump_path, 'rb') as stream:
+                yield from iter_xml_sortkeys(stream)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        sys.exit(f'Использование: {sys.argv[0]} <путь к дампу>')
+    counter = DumpAnimalNameCounter(sys.argv[1])
+    counter.load()
+    print('\n')
+    counter.print()
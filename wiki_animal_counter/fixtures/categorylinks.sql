@@ -0,0 +1,43 @@
+-- MySQL dump 10.19  Distrib 10.3.38-MariaDB, for debian-linux-gnu (x86_64)
+--
+-- Host: db1234    Database: ruwiki
+-- ------------------------------------------------------
+-- Server version	10.4.26-MariaDB-log
+
+/*!40101 SET @OLD_CHARACTER_SET_CLIENT=@@CHARACTER_SET_CLIENT */;
+/*!40101 SET NAMES utf8mb4 */;
+
+--
+-- Table structure for table `categorylinks`
+--
+
+DROP TABLE IF EXISTS `categorylinks`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8 */;
+CREATE TABLE `categorylinks` (
+  `cl_from` int(8) unsigned NOT NULL DEFAULT 0,
+  `cl_to` varbinary(255) NOT NULL DEFAULT '',
+  `cl_sortkey` varbinary(230) NOT NULL DEFAULT '',
+  `cl_sortkey_prefix` varbinary(255) NOT NULL DEFAULT '',
+  `cl_timestamp` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp(),
+  `cl_collation` varbinary(32) NOT NULL DEFAULT '',
+  `cl_type` enum('page','subcat','file') NOT NULL DEFAULT 'page',
+  PRIMARY KEY (`cl_from`,`cl_to`),
+  KEY `cl_timestamp` (`cl_to`,`cl_timestamp`),
+  KEY `cl_sortkey` (`cl_to`,`cl_type`,`cl_sortkey`,`cl_from`),
+  KEY `cl_collation_ext` (`cl_collation`,`cl_to`,`cl_type`,`cl_from`)
+) ENGINE=InnoDB DEFAULT CHARSET=binary ROW_FORMAT=COMPRESSED;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `categorylinks`
+--
+
+/*!40000 ALTER TABLE `categorylinks` DISABLE KEYS */;
+INSERT INTO `categorylinks` VALUES (1,'Птицы_по_алфавиту','АИСТ','','2020-01-01 00:00:00','uppercase','page'),(2,'Животные_по_алфавиту_(устаревшее)','БОБР','','2020-01-01 00:00:00','uppercase','page'),(100,'Животные_по_алфавиту','ЁРШ','','2021-03-02 12:00:00','uppercase','page'),(101,'Животные_по_алфавиту','АИСТ','','2021-03-03 12:00:00','uppercase','page'),(102,'Животные_по_алфавиту','АКУЛА','','2021-03-04 12:00:00','uppercase','page'),(103,'Животные_по_алфавиту','АЛЬБАТРОС','','2021-03-05 12:00:00','uppercase','page'),(104,'Животные_по_алфавиту','АНТИЛОПА','','2021-03-06 12:00:00','uppercase','page'),(105,'Животные_по_алфавиту','БАРСУК','','2021-03-07 12:00:00','uppercase','page'),(106,'Животные_по_алфавиту','БИЗОН','','2021-03-08 12:00:00','uppercase','page'),(107,'Животные_по_алфавиту','БОБР','','2021-03-09 12:00:00','uppercase','page'),(108,'Животные_по_алфавиту','ВЕРБЛЮД','','2021-03-01 12:00:00','uppercase','page'),(109,'Животные_по_алфавиту','ВОЛК','','2021-03-02 12:00:00','uppercase','page'),(110,'Животные_по_алфавиту','ВЫДРА','','2021-03-03 12:00:00','uppercase','page'),(111,'Животные_по_алфавиту','ГЕПАРД','','2021-03-04 12:00:00','uppercase','page'),(112,'Животные_по_алфавиту','ГОРИЛЛА','','2021-03-05 12:00:00','uppercase','page'),(113,'Животные_по_алфавиту','ДЕЛЬФИН','','2021-03-06 12:00:00','uppercase','page'),(114,'Животные_по_алфавиту','ЕНОТ','','2021-03-07 12:00:00','uppercase','page'),(115,'Животные_по_алфавиту','ЖАБА','','2021-03-08 12:00:00','uppercase','page'),(116,'Животные_по_алфавиту','ЖИРАФ','','2021-03-09 12:00:00','uppercase','page'),(117,'Животные_по_алфавиту','ЗЕБРА','','2021-03-01 12:00:00','uppercase','page'),(118,'Животные_по_алфавиту','ИБИС','','2021-03-02 12:00:00','uppercase','page'),(119,'Животные_по_алфавиту','КАБАН','','2021-03-03 12:00:00','uppercase','page'),(120,'Животные_по_алфавиту','КЕНГУРУ','','2021-03-04 12:00:00','uppercase','page'),(121,'Животные_по_алфавиту','КОАЛА','','2021-03-05 12:00:00','uppercase','page'),(122,'Животные_по_алфавиту','КРОТ','','2021-03-06 12:00:00','uppercase','page'),(123,'Животные_по_алфавиту','ЛАМА','','2021-03-07 12:00:00','uppercase','page'),(124,'Животные_по_алфавиту','ЛЕВ','','2021-03-08 12:00:00','uppercase','page'),(125,'Животные_по_алфавиту','ЛИСА (ОБЫКНОВЕННАЯ, \'РЫЖАЯ\')','','2021-03-09 12:00:00','uppercase','page'),(126,'Животные_по_алфавиту','МЕДВЕДЬ','','2021-03-01 12:00:00','uppercase','page');
+INSERT INTO `categorylinks` VALUES (6,'Млекопитающие','ВОЛК','','2020-01-01 00:00:00','uppercase','page'),(7,'Хищные','ЛИСА','','2020-01-01 00:00:00','uppercase','page');
+INSERT INTO `categorylinks` VALUES (127,'Животные_по_алфавиту','МОРЖ','','2021-03-02 12:00:00','uppercase','page'),(128,'Животные_по_алфавиту','НОСОРОГ','','2021-03-03 12:00:00','uppercase','page'),(129,'Животные_по_алфавиту','ОКАПИ','','2021-03-04 12:00:00','uppercase','page'),(130,'Животные_по_алфавиту','ОЛЕНЬ','','2021-03-05 12:00:00','uppercase','page'),(131,'Животные_по_алфавиту','ПИНГВИН','','2021-03-06 12:00:00','uppercase','page'),(132,'Животные_по_алфавиту','РЫСЬ','','2021-03-07 12:00:00','uppercase','page'),(133,'Животные_по_алфавиту','СЛОН','','2021-03-08 12:00:00','uppercase','page'),(134,'Животные_по_алфавиту','СУРОК','','2021-03-09 12:00:00','uppercase','page'),(135,'Животные_по_алфавиту','ТИГР','','2021-03-01 12:00:00','uppercase','page'),(136,'Животные_по_алфавиту','ТЮЛЕНЬ','','2021-03-02 12:00:00','uppercase','page'),(137,'Животные_по_алфавиту','УДАВ','','2021-03-03 12:00:00','uppercase','page'),(138,'Животные_по_алфавиту','ФИЛИН','','2021-03-04 12:00:00','uppercase','page'),(139,'Животные_по_алфавиту','ХОРЁК\nСТЕПНОЙ','','2021-03-05 12:00:00','uppercase','page'),(140,'Животные_по_алфавиту','ЦАПЛЯ','','2021-03-06 12:00:00','uppercase','page'),(141,'Животные_по_алфавиту','ЧЕРЕПАХА','','2021-03-07 12:00:00','uppercase','page'),(142,'Животные_по_алфавиту','ШАКАЛ','','2021-03-08 12:00:00','uppercase','page'),(143,'Животные_по_алфавиту','ЩУКА','','2021-03-09 12:00:00','uppercase','page'),(144,'Животные_по_алфавиту','ЭМУ','','2021-03-01 12:00:00','uppercase','page'),(145,'Животные_по_алфавиту','ЮРОК','','2021-03-02 12:00:00','uppercase','page'),(146,'Животные_по_алфавиту','ЯК','','2021-03-03 12:00:00','uppercase','page'),(147,'Животные_по_алфавиту','ЯСТРЕБ','','2021-03-04 12:00:00','uppercase','page'),(148,'Животные_по_алфавиту','AARDVARK','','2021-03-05 12:00:00','uppercase','page'),(149,'Животные_по_алфавиту','ALBATROSS','','2021-03-06 12:00:00','uppercase','page'),(150,'Животные_по_алфавиту','BADGER','','2021-03-07 12:00:00','uppercase','page'),(151,'Животные_по_алфавиту','BISON','','2021-03-08 12:00:00','uppercase','page'),(152,'Животные_по_алфавиту','CAMEL','','2021-03-09 12:00:00','uppercase','page'),(153,'Животные_по_алфавиту','DOLPHIN','','2021-03-01 12:00:00','uppercase','page'),(3,'Животные_по_алфавиту','ВЫМЕРШИЕ ЖИВОТНЫЕ','','2020-01-01 00:00:00','uppercase','subcat'),(4,'Животные_по_алфавиту','ГЕРБ С ЖИВОТНЫМ.SVG','','2020-01-01 00:00:00','uppercase','file'),(5,'Млекопитающие',NULL,'','2020-01-01 00:00:00','uppercase','page');
+/*!40000 ALTER TABLE `categorylinks` ENABLE KEYS */;
+/*!40101 SET CHARACTER_SET_CLIENT=@OLD_CHARACTER_SET_CLIENT */;
+
+-- Dump completed on 2024-01-01  3:14:15
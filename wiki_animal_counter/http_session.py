@@ -0,0 +1,108 @@
+"""
+HTTP сессия для загрузки страниц Википедии.
+
+Одна `requests.Session` на `Счетчик` вместо вызова `requests.get`
+для каждой страницы:
+ - пул соединений с keep-alive - повторное использование TCP/TLS
+   соединения с сервером;
+ - сжатие ответов (gzip/deflate, а при установленном пакете
+   `brotli` - также br);
+ - повтор запросов при ошибках соединения и ответах 429/5xx
+   с экспоненциальной задержкой, случайной добавкой (jitter)
+   и учетом заголовка `Retry-After`.
+
+В urllib3 2.x случайная добавка задается параметром `backoff_jitter`
+самого `Retry`. Для urllib3 1.26, где такого параметра нет,
+используется `JitterRetry`.
+"""
+
+import inspect
+import random
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_BACKOFF_JITTER = 0.5
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RETRIES = 5
+DEFAULT_TIMEOUT = (5, 30)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+NATIVE_BACKOFF_JITTER = (
+    'backoff_jitter' in inspect.signature(Retry.__init__).parameters
+)
+USER_AGENT = (
+    'WikiAnimalNameCounter/1.0 '
+    '(https://github.com/SamMirabyan/test_assignments)'
+)
+
+
+class JitterRetry(Retry):
+    """
+    `Retry` со случайной добавкой к экспоненциальной задержке,
+    чтобы повторные запросы нескольких клиентов не совпадали по времени.
+    Используется только с urllib3 1.26 (см. `make_retry`).
+    """
+
+    def __init__(self, *args, backoff_jitter=0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.backoff_jitter = backoff_jitter
+
+    def new(self, **kwargs):
+        kwargs.setdefault('backoff_jitter', self.backoff_jitter)
+        return super().new(**kwargs)
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        if self.backoff_jitter:
+            backoff += random.uniform(0, self.backoff_jitter)
+        return min(backoff, self.DEFAULT_BACKOFF_MAX)
+
+
+def make_retry(
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    backoff_jitter: float = DEFAULT_BACKOFF_JITTER
+        ) -> Retry:
+    """
+    Настройки повтора запросов: `Retry` со встроенной случайной
+    добавкой, если версия urllib3 ее поддерживает, иначе `JitterRetry`.
+    """
+    retry_class = Retry if NATIVE_BACKOFF_JITTER else JitterRetry
+    return retry_class(
+        total=retries,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=('GET', 'HEAD'),
+        respect_retry_after_header=True,
+    )
+
+
+def make_session(
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    backoff_jitter: float = DEFAULT_BACKOFF_JITTER,
+    pool_size: int = DEFAULT_POOL_SIZE
+        ) -> requests.Session:
+    """
+    Сессия с пулом из `pool_size` соединений на хост и `retries`
+    повторами запроса. Задержка перед n-м повтором -
+    `backoff_factor * 2 ** (n - 1)` секунд плюс случайная добавка
+    до `backoff_jitter` секунд, либо значение `Retry-After` из ответа.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=make_retry(retries, backoff_factor, backoff_jitter),
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'User-Agent': USER_AGENT,
+    })
+    return session
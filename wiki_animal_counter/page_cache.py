@@ -0,0 +1,185 @@
+"""
+Дисковый кэш страниц категории для условных HTTP запросов.
+
+Для каждого URL в отдельном JSON файле хранятся тело страницы,
+заголовки `ETag` и `Last-Modified` и результат разбора страницы.
+При повторной загрузке `Счетчик` отправляет `If-None-Match`
+и `If-Modified-Since`, и на ответ `304 Not Modified` использует
+сохраненный результат разбора без загрузки и разбора страницы.
+
+Ограничения:
+ - `max_age` - записи старше указанного количества секунд
+   не используются и загружаются заново;
+ - `max_bytes` - при превышении суммарного размера файлов
+   удаляются записи, которые дольше всего не использовались.
+
+Время сохранения или последнего использования записи - время
+изменения ее файла: ответ `304` обновляет только его (`os.utime`),
+не перезаписывая запись.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict, NamedTuple, Optional
+
+from page_parser import CategoryPage
+
+ENTRY_SUFFIX = '.json'
+
+
+class CacheEntry(NamedTuple):
+    """ Сохраненная страница с заголовками для повторной проверки. """
+    url: str
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    page: CategoryPage
+
+    def validators(self) -> Dict[str, str]:
+        """ Заголовки условного запроса. """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """ Кэш страниц в каталоге `directory`, один файл на URL. """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None
+            ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        name = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, name + ENTRY_SUFFIX)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        Запись для `url` или None, если записи нет, она устарела
+        или не может быть прочитана.
+        """
+        path = self._path(url)
+        try:
+            stored_at = os.stat(path).st_mtime
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if data.get('url') != url:
+            return None
+        if self.max_age is not None and time.time() - stored_at > self.max_age:
+            self._remove(path)
+            return None
+        return CacheEntry(
+            url=url,
+            body=data['body'],
+            etag=data['etag'],
+            last_modified=data['last_modified'],
+            stored_at=stored_at,
+            page=CategoryPage(
+                [tuple(group) for group in data['groups']],
+                data['next_href']
+            ),
+        )
+
+    def touch(self, url: str) -> None:
+        """
+        Отмечает использование записи после ответа `304`:
+        запись считается свежей и не будет вытеснена первой.
+        Обновляется только время изменения файла.
+        """
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def put(
+        self,
+        url: str,
+        body: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        page: CategoryPage
+            ) -> bool:
+        """
+        Сохраняет страницу, если у ответа есть `ETag` или `Last-Modified`.
+        Возвращает True, если запись сохранена.
+        """
+        if not etag and not last_modified:
+            return False
+        self._write(self._path(url), {
+            'url': url,
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'groups': page.groups,
+            'next_href': page.next_href,
+        })
+        self._evict()
+        return True
+
+    def clear(self) -> None:
+        """ Удаляет все записи. """
+        for name in os.listdir(self.directory):
+            if name.endswith(ENTRY_SUFFIX):
+                self._remove(os.path.join(self.directory, name))
+
+    def size(self) -> int:
+        """ Суммарный размер записей в байтах. """
+        return sum(size for _, _, size in self._entries())
+
+    def _write(self, path: str, data: Dict) -> None:
+        """ Атомарная запись: временный файл заменяет запись целиком. """
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.directory, suffix='.tmp'
+        )
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                json.dump(data, file, ensure_ascii=False)
+            os.replace(temporary_path, path)
+        except BaseException:
+            self._remove(temporary_path)
+            raise
+
+    def _entries(self):
+        """ Тройки (время изменения, путь, размер) всех записей. """
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                yield stat.st_mtime, entry.path, stat.st_size
+
+    def _evict(self) -> None:
+        """ Удаляет давно использованные записи сверх `max_bytes`. """
+        if self.max_bytes is None:
+            return
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
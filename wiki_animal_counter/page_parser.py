@@ -0,0 +1,202 @@
+"""
+Разбор страниц категории `Животные по алфавиту`.
+
+Из страницы `Счетчику` нужны только заголовки букв (<h3>),
+количество элементов <li> под каждым заголовком и ссылка
+на следующую страницу. Реализации разбора:
+ - `soup` - полное дерево BeautifulSoup всей страницы;
+ - `strainer` - дерево BeautifulSoup, построенное только
+   для блока `div#mw-pages` (`SoupStrainer`);
+ - `events` - однопроходный разбор событий `lxml` без построения
+   дерева страницы: обработанные элементы сразу удаляются.
+
+Все реализации возвращают `CategoryPage`.
+
+`find_next_href` - быстрый поиск ссылки на следующую страницу
+регулярным выражением без разбора страницы, чтобы начать ее
+загрузку до разбора текущей страницы.
+"""
+
+import html
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from lxml import etree
+
+CATEGORY_TITLE = 'Категория:Животные по алфавиту'
+COLUMNS_CLASS = 'mw-category-columns'
+FEED_SIZE = 64 * 1024
+NEXT_PAGE_TEXT = 'Следующая страница'
+PAGES_ID = 'mw-pages'
+LINK_PATTERN = re.compile(
+    r'<a\s([^>]*)>\s*' + re.escape(NEXT_PAGE_TEXT) + r'\s*</a>'
+)
+ATTRIBUTE_PATTERN = re.compile(r'([\w-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+
+
+class CategoryPage(NamedTuple):
+    """
+    Результат разбора страницы: пары (заголовок буквы, количество
+    названий) в порядке следования и ссылка на следующую страницу
+    (None, если ссылки нет).
+    """
+    groups: List[Tuple[str, int]]
+    next_href: Optional[str]
+
+
+def _parse_soup(soup, category_title: str) -> CategoryPage:
+    """ Извлекает данные страницы из дерева BeautifulSoup. """
+    groups = []
+    columns = soup.find('div', COLUMNS_CLASS)
+    if columns is not None:
+        for animal in columns.contents:
+            if not isinstance(animal, Tag):
+                continue
+            groups.append(
+                (animal.find('h3').text, len(animal.find_all('li')))
+            )
+    next_href = None
+    pages = soup.find('div', attrs={'id': PAGES_ID})
+    if pages is not None:
+        for page in pages.find_all('a', attrs={'title': category_title}):
+            if page.text == NEXT_PAGE_TEXT:
+                next_href = page.get('href')
+                break
+    return CategoryPage(groups, next_href)
+
+
+def parse_category_page_soup(
+    contents: str,
+    category_title: str = CATEGORY_TITLE
+        ) -> CategoryPage:
+    """ Разбор с построением полного дерева страницы. """
+    return _parse_soup(BeautifulSoup(contents, 'lxml'), category_title)
+
+
+def parse_category_page_strainer(
+    contents: str,
+    category_title: str = CATEGORY_TITLE
+        ) -> CategoryPage:
+    """ Разбор с построением дерева только для блока `div#mw-pages`. """
+    soup = BeautifulSoup(
+        contents, 'lxml', parse_only=SoupStrainer('div', id=PAGES_ID)
+    )
+    return _parse_soup(soup, category_title)
+
+
+def _has_class(element, class_name: str) -> bool:
+    return class_name in element.get('class', '').split()
+
+
+class _EventState:
+    """ Состояние однопроходного разбора между частями страницы. """
+
+    def __init__(self, category_title: str) -> None:
+        self.category_title = category_title
+        self.groups = []
+        self.next_href = None
+        self.columns = None
+        self.columns_done = False
+        self.pages = None
+
+    def handle(self, events) -> None:
+        for event, element in events:
+            if event == 'start':
+                self.start(element)
+            else:
+                self.end(element)
+
+    def start(self, element) -> None:
+        if element.tag != 'div':
+            return
+        if (
+            self.columns is None
+            and not self.columns_done
+            and _has_class(element, COLUMNS_CLASS)
+        ):
+            self.columns = element
+        elif self.pages is None and element.get('id') == PAGES_ID:
+            self.pages = element
+
+    def end(self, element) -> None:
+        if self.columns is not None:
+            if element is self.columns:
+                self.columns = None
+                self.columns_done = True
+            elif element.tag == 'h3':
+                self.groups.append([''.join(element.itertext()), 0])
+            elif element.tag == 'li' and self.groups:
+                self.groups[-1][1] += 1
+        if self.pages is not None:
+            if element is self.pages:
+                self.pages = None
+            elif (
+                element.tag == 'a'
+                and self.next_href is None
+                and element.get('title') == self.category_title
+                and ''.join(element.itertext()) == NEXT_PAGE_TEXT
+            ):
+                self.next_href = element.get('href')
+
+        #  Закрытый элемент больше не нужен: очищаем его
+        #  и удаляем из родителя предыдущие (уже очищенные) элементы.
+        parent = element.getparent()
+        if parent is None:
+            return
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def parse_category_page_events(
+    contents: str,
+    category_title: str = CATEGORY_TITLE
+        ) -> CategoryPage:
+    """
+    Однопроходный разбор событий `start`/`end` парсера `lxml`.
+    Страница передается парсеру частями по `FEED_SIZE` символов,
+    а каждый закрытый элемент очищается и удаляется из родителя,
+    поэтому в памяти находится только текущая ветка документа.
+    """
+    parser = etree.HTMLPullParser(events=('start', 'end'))
+    state = _EventState(category_title)
+    for offset in range(0, len(contents), FEED_SIZE):
+        parser.feed(contents[offset:offset + FEED_SIZE])
+        state.handle(parser.read_events())
+    parser.close()
+    state.handle(parser.read_events())
+    return CategoryPage(
+        [tuple(group) for group in state.groups], state.next_href
+    )
+
+
+def find_next_href(
+    contents: str,
+    category_title: str = CATEGORY_TITLE
+        ) -> Optional[str]:
+    """
+    Ссылка на следующую страницу, найденная без разбора страницы,
+    или None. Результат может не совпасть с результатом разбора
+    на нестандартной разметке, поэтому используется только
+    для предварительной загрузки.
+    """
+    for link in LINK_PATTERN.finditer(contents):
+        attributes = {
+            name.lower(): html.unescape(
+                double_quoted if double_quoted is not None else single_quoted
+            )
+            for name, double_quoted, single_quoted
+            in ATTRIBUTE_PATTERN.findall(link.group(1))
+        }
+        if attributes.get('title') == category_title and 'href' in attributes:
+            return attributes['href']
+    return None
+
+
+PARSERS: Dict[str, Callable[..., CategoryPage]] = {
+    'soup': parse_category_page_soup,
+    'strainer': parse_category_page_strainer,
+    'events': parse_category_page_events,
+}
+DEFAULT_PARSER = 'events'
@@ -0,0 +1,106 @@
+"""
+Конвейерная загрузка страниц категории.
+
+Фоновый поток загружает страницы одну за другой, находя ссылку
+на следующую страницу быстрым поиском без разбора страницы,
+а основной поток в это время разбирает уже загруженные страницы.
+Очередь между потоками ограничена `depth` страницами, поэтому
+в памяти находится не более `depth + 1` загруженных страниц.
+При высокой задержке сети время обработки страницы приближается
+к max(загрузка, разбор) вместо их суммы.
+"""
+
+import threading
+from queue import Full, Queue
+from typing import Any, Callable, Optional
+
+PUT_TIMEOUT = 0.1
+
+
+class PagePrefetcher:
+    """
+    Заранее загружает страницы, начиная с запрошенной.
+
+    `fetch(url)` - загрузка страницы;
+    `next_url(fetched)` - ссылка на следующую страницу
+    по результату загрузки или None.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Any],
+        next_url: Callable[[Any], Optional[str]],
+        depth: int = 1
+            ) -> None:
+        if depth < 1:
+            raise ValueError('Глубина очереди должна быть положительной')
+        self._fetch = fetch
+        self._next_url = next_url
+        self.depth = depth
+        self._queue = None
+        self._stop = None
+        self._thread = None
+
+    def get(self, url: str) -> Any:
+        """
+        Результат загрузки страницы `url`. Если фоновый поток загружает
+        другие страницы (ссылка на следующую страницу, найденная
+        без разбора, не совпала с результатом разбора), загрузка
+        начинается заново с `url`. Ошибка загрузки в фоновом
+        потоке передается в вызывающий поток.
+        """
+        if self._thread is None:
+            self._start(url)
+        item_url, fetched, error = self._queue.get()
+        if item_url != url:
+            self.close()
+            self._start(url)
+            item_url, fetched, error = self._queue.get()
+        if error is not None:
+            self.close()
+            raise error
+        return fetched
+
+    def close(self) -> None:
+        """ Останавливает фоновый поток. """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _start(self, url: str) -> None:
+        self._queue = Queue(maxsize=self.depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(url, self._queue, self._stop), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, url, queue, stop) -> None:
+        while url is not None and not stop.is_set():
+            try:
+                fetched = self._fetch(url)
+                next_url = self._next_url(fetched)
+            except BaseException as error:
+                self._put(queue, stop, (url, None, error))
+                return
+            self._put(queue, stop, (url, fetched, None))
+            url = next_url
+        #  Ссылки на следующую страницу нет: сообщаем о конце обхода.
+        self._put(queue, stop, (None, None, None))
+
+    @staticmethod
+    def _put(queue, stop, item) -> None:
+        """ Добавляет элемент в очередь, пока поток не остановлен. """
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=PUT_TIMEOUT)
+                return
+            except Full:
+                continue
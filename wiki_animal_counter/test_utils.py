@@ -0,0 +1,288 @@
+"""
+Локальный HTTP сервер, имитирующий страницы категории
+`Животные по алфавиту` и MediaWiki API, для тестов `Счетчика`.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from wiki_animal_counter import WikiAnimalNameCounter
+from wiki_api_counter import WikiApiAnimalNameCounter
+
+CATEGORY_PATH = '/wiki/Категория:Животные_по_алфавиту'
+CATEGORY_TITLE = 'Категория:Животные по алфавиту'
+RUSSIAN_TITLES = sorted([
+    'Аист', 'Акула', 'Альбатрос', 'Антилопа', 'Барсук', 'Бобр', 'Бизон',
+    'Верблюд', 'Волк', 'Выдра', 'Гепард', 'Горилла', 'Дельфин', 'Енот',
+    'Жираф', 'Жаба', 'Зебра', 'Ибис', 'Кабан', 'Кенгуру', 'Коала', 'Крот',
+    'Лама', 'Лев', 'Лиса', 'Медведь', 'Морж', 'Носорог', 'Окапи', 'Олень',
+    'Пингвин', 'Рысь', 'Слон', 'Сурок', 'Тигр', 'Тюлень', 'Удав',
+    'Филин', 'Хорёк', 'Цапля', 'Черепаха', 'Шакал', 'Щука', 'Эму',
+    'Ёрш', 'Юрок', 'Як', 'Ястреб',
+], key=str.upper)
+ENGLISH_TITLES = [
+    'Aardvark', 'Albatross', 'Badger', 'Bison', 'Camel', 'Dolphin',
+]
+#  Как и в категории на Википедии, русские названия идут перед английскими.
+TITLES = RUSSIAN_TITLES + ENGLISH_TITLES
+HTML_PAGE_SIZE = 5
+
+
+def expected_counts():
+    """ Количество названий по первым буквам до первой латинской буквы. """
+    counts = {}
+    for title in RUSSIAN_TITLES:
+        letter = title[0].upper()
+        counts[letter] = counts.get(letter, 0) + 1
+    return counts
+
+
+def render_category_page(page):
+    """
+    HTML страница категории с номером `page`: группы названий
+    по первой букве и ссылки на соседние страницы.
+    """
+    titles = TITLES[page * HTML_PAGE_SIZE:(page + 1) * HTML_PAGE_SIZE]
+    groups = {}
+    for title in titles:
+        groups.setdefault(title[0].upper(), []).append(title)
+    columns = ''.join(
+        f'<div class="mw-category-group"><h3>{letter}</h3><ul>'
+        + ''.join(f'<li><a href="#">{title}</a></li>' for title in group)
+        + '</ul></div>'
+        for letter, group in groups.items()
+    )
+    links = []
+    if page > 0:
+        links.append(
+            f'<a href="{CATEGORY_PATH}?page={page - 1}" '
+            f'title="{CATEGORY_TITLE}">Предыдущая страница</a>'
+        )
+    links.append(
+        f'<a href="{CATEGORY_PATH}?page={page + 1}" '
+        f'title="{CATEGORY_TITLE}">Следующая страница</a>'
+    )
+    return (
+        '<html><body><div id="mw-pages">'
+        + ' '.join(links)
+        + f'<div class="mw-category mw-category-columns">{columns}</div>'
+        + ' '.join(links)
+        + '</div></body></html>'
+    )
+
+
+def category_members(params):
+    """
+    Ответ `list=categorymembers` с учетом диапазона и продолжения.
+    Как и в MediaWiki с сортировкой `uppercase`, ключи сортировки
+    и границы диапазона сравниваются в верхнем регистре.
+    """
+    if params.get('cmtitle', CATEGORY_TITLE) != CATEGORY_TITLE:
+        return {
+            'error': {
+                'code': 'invalidcategory',
+                'info': 'The category name you entered is not valid.',
+            }
+        }
+    start = params.get('cmstartsortkeyprefix', '').upper()
+    end = params.get('cmendsortkeyprefix')
+    if end is not None:
+        end = end.upper()
+    members = sorted(
+        (
+            title for title in TITLES
+            if title.upper() >= start and (end is None or title.upper() < end)
+        ),
+        key=str.upper
+    )
+    offset = int(params.get('cmcontinue', 0))
+    limit = int(params.get('cmlimit', 10))
+    response = {
+        'batchcomplete': '',
+        'query': {
+            'categorymembers': [
+                {
+                    'pageid': TITLES.index(title),
+                    'ns': 0,
+                    'title': title,
+                    'sortkeyprefix': '',
+                }
+                for title in members[offset:offset + limit]
+            ]
+        },
+    }
+    if offset + limit < len(members):
+        response['continue'] = {
+            'cmcontinue': str(offset + limit),
+            'continue': '-||',
+        }
+    return response
+
+
+class StubWikiHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик запросов к страницам категории и API.
+    Поддерживает keep-alive, сжатие gzip и условные запросы
+    к страницам категории (`ETag` и `Last-Modified`).
+    """
+    protocol_version = 'HTTP/1.1'
+    #  Заголовки и тело ответа отправляются отдельно: без TCP_NODELAY
+    #  тело ждет подтверждения заголовков (задержка до 40 мс).
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.connections.add(self.client_address)
+            fail = server.failures > 0 or (
+                server.fail_after is not None
+                and server.requests > server.fail_after
+            )
+            if server.failures > 0:
+                server.failures -= 1
+        try:
+            if fail:
+                self.respond_unavailable()
+                return
+            time.sleep(server.delay)
+            self.respond()
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def respond(self):
+        url = urlparse(self.path)
+        params = {
+            key: values[0] for key, values in parse_qs(url.query).items()
+        }
+        if url.path == '/w/api.php':
+            body = json.dumps(category_members(params)).encode()
+            content_type = 'application/json'
+        else:
+            page = int(params.get('page', 0))
+            body = render_category_page(page).encode()
+            content_type = 'text/html; charset=utf-8'
+            if self.respond_not_modified(body):
+                return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        if url.path != '/w/api.php' and self.server.validators:
+            etag, last_modified = self.page_validators(body)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+            with self.server.lock:
+                self.server.compressed += 1
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def page_validators(self, body):
+        """ `ETag` и `Last-Modified` страницы текущей версии сервера. """
+        version = self.server.version
+        digest = hashlib.sha256(body + str(version).encode()).hexdigest()
+        last_modified = formatdate(1700000000 + version, usegmt=True)
+        return f'"{digest[:16]}"', last_modified
+
+    def respond_not_modified(self, body):
+        """ Отвечает `304`, если страница не изменилась. """
+        if not self.server.validators:
+            return False
+        etag, last_modified = self.page_validators(body)
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            not_modified = if_none_match == etag
+        else:
+            not_modified = (
+                self.headers.get('If-Modified-Since') == last_modified
+            )
+        if not not_modified:
+            return False
+        with self.server.lock:
+            self.server.not_modified += 1
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.end_headers()
+        return True
+
+    def respond_unavailable(self):
+        body = b'Service Unavailable'
+        self.send_response(503)
+        self.send_header('Retry-After', str(self.server.retry_after))
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubWikiServer:
+    """
+    Запускает сервер в отдельном потоке на время блока `with`.
+    `delay` - задержка ответа в секундах.
+    `failures` - количество первых запросов, на которые сервер
+    отвечает 503 с заголовком `Retry-After: retry_after`.
+    `server.fail_after` - количество запросов, после которого сервер
+    отвечает 503 на все запросы (имитация длительного сбоя).
+    `validators` - отправлять `ETag` и `Last-Modified` и отвечать
+    на условные запросы; изменение `server.version` имитирует
+    изменение страниц.
+    """
+
+    def __init__(self, delay=0.0, failures=0, retry_after=0, validators=True):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubWikiHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.server.connections = set()
+        self.server.compressed = 0
+        self.server.delay = delay
+        self.server.failures = failures
+        self.server.retry_after = retry_after
+        self.server.validators = validators
+        self.server.fail_after = None
+        self.server.version = 0
+        self.server.not_modified = 0
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.thread = threading.Thread(target=self.server.serve_forever)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+def make_html_counter(server, counter_class=WikiAnimalNameCounter, **kwargs):
+    """ `Счетчик` HTML страниц, направленный на локальный сервер. """
+    class StubHtmlCounter(counter_class):
+        BASE_URL = server.url + CATEGORY_PATH
+        WIKI_DOMAIN = server.url
+
+    return StubHtmlCounter(**kwargs)
+
+
+def make_api_counter(server, counter_class=WikiApiAnimalNameCounter, **kwargs):
+    """ `Счетчик` API, направленный на локальный сервер. """
+    class StubApiCounter(counter_class):
+        API_URL = server.url + '/w/api.php'
+        PAGE_LIMIT = 2
+
+    return StubApiCounter(**kwargs)
@@ -0,0 +1,644 @@
+""" Тесты `Счетчика` названий животных на локальном сервере. """
+
+import bz2
+import contextlib
+import gzip
+import io
+import json
+import os
+import tempfile
+import shutil
+import time
+import tracemalloc
+import unittest
+
+from urllib3.util.retry import RequestHistory
+
+from benchmark import generate_page
+from dump_counter import DumpAnimalNameCounter, iter_sql_rows, parse_values
+from http_session import JitterRetry, make_retry
+from page_cache import PageCache
+from page_parser import PARSERS, CategoryPage, find_next_href
+from wiki_animal_counter import WikiAnimalNameCounter
+from wiki_api_counter import WikiApiAnimalNameCounter
+from test_utils import (
+    HTML_PAGE_SIZE,
+    TITLES,
+    StubWikiServer,
+    expected_counts,
+    make_api_counter,
+    make_html_counter,
+    render_category_page
+)
+
+
+def load_quietly(counter):
+    """ Запускает `Счетчик`, скрывая вывод о ходе обработки. """
+    with contextlib.redirect_stdout(io.StringIO()):
+        counter.load()
+    return counter
+
+
+class TestWikiAnimalNameCounter(unittest.TestCase):
+    """ Тесты обхода HTML страниц категории. """
+
+    def test_counts_by_letter(self):
+        with StubWikiServer() as server:
+            counter = load_quietly(make_html_counter(server))
+        self.assertEqual(
+            dict(counter.items()),
+            expected_counts(),
+            msg=(
+                'Убедитесь, что `Счетчик` подсчитывает названия '
+                'по буквам до первой латинской буквы'
+            )
+        )
+
+
+class TestPageParser(unittest.TestCase):
+    """ Тесты реализаций разбора страниц категории. """
+
+    def assert_parsers_agree(self, contents):
+        expected = PARSERS['soup'](contents)
+        for name, parse in PARSERS.items():
+            with self.subTest(parser=name):
+                self.assertEqual(
+                    parse(contents),
+                    expected,
+                    msg=(
+                        f'Убедитесь, что разбор `{name}` возвращает '
+                        'тот же результат, что и полное дерево страницы'
+                    )
+                )
+        return expected
+
+    def test_stub_pages(self):
+        for page in range(len(TITLES) // HTML_PAGE_SIZE + 1):
+            self.assert_parsers_agree(render_category_page(page))
+
+    def test_generated_page(self):
+        page = self.assert_parsers_agree(generate_page(items=200))
+        self.assertEqual(sum(count for _, count in page.groups), 200)
+        self.assertEqual(page.next_href, '/w/index.php?pagefrom=2')
+
+    def test_page_larger_than_feed_size(self):
+        self.assert_parsers_agree(generate_page(items=500, padding=5000))
+
+    def test_missing_next_page(self):
+        contents = render_category_page(0).replace('Следующая', 'Другая')
+        self.assertIsNone(self.assert_parsers_agree(contents).next_href)
+
+    def test_find_next_href(self):
+        pages = [render_category_page(page) for page in range(3)]
+        pages.append(
+            generate_page().replace('?pagefrom=2', '?a=1&amp;pagefrom=2')
+        )
+        pages.append(pages[0].replace('Следующая', 'Другая'))
+        for contents in pages:
+            self.assertEqual(
+                find_next_href(contents),
+                PARSERS['soup'](contents).next_href
+            )
+
+    def test_counter_parsers(self):
+        with StubWikiServer() as server:
+            for parser in PARSERS:
+                with self.subTest(parser=parser):
+                    counter = make_html_counter(server, parser=parser)
+                    self.assertEqual(
+                        dict(load_quietly(counter).items()),
+                        expected_counts()
+                    )
+
+    def test_unknown_parser(self):
+        with StubWikiServer() as server, self.assertRaises(ValueError):
+            make_html_counter(server, parser='regex')
+
+
+class TestPageCache(unittest.TestCase):
+    """ Тесты дискового кэша страниц и условных запросов. """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_reload_without_changes(self):
+        with StubWikiServer() as server:
+            counter = make_html_counter(
+                server, cache=PageCache(self.directory.name)
+            )
+            load_quietly(counter)
+            requests = server.server.requests
+            with contextlib.redirect_stdout(io.StringIO()):
+                counter.reload()
+            stub = server.server
+        self.assertEqual(dict(counter.items()), expected_counts())
+        self.assertEqual(stub.requests, 2 * requests)
+        self.assertEqual(
+            stub.not_modified,
+            requests,
+            msg=(
+                'Убедитесь, что повторная загрузка без изменений '
+                'получает только ответы `304 Not Modified`'
+            )
+        )
+
+    def test_cache_shared_between_counters(self):
+        cache = PageCache(self.directory.name)
+        with StubWikiServer() as server:
+            load_quietly(make_html_counter(server, cache=cache))
+            counter = load_quietly(make_html_counter(server, cache=cache))
+            self.assertEqual(
+                server.server.not_modified, server.server.requests // 2
+            )
+        self.assertEqual(dict(counter.items()), expected_counts())
+
+    def test_changed_pages(self):
+        with StubWikiServer() as server:
+            counter = make_html_counter(
+                server, cache=PageCache(self.directory.name)
+            )
+            load_quietly(counter)
+            server.server.version += 1
+            with contextlib.redirect_stdout(io.StringIO()):
+                counter.reload()
+            self.assertEqual(server.server.not_modified, 0)
+        self.assertEqual(dict(counter.items()), expected_counts())
+
+    def test_last_modified_only(self):
+        cache = PageCache(self.directory.name)
+        with StubWikiServer() as server:
+            load_quietly(make_html_counter(server, cache=cache))
+            for name in os.listdir(self.directory.name):
+                path = os.path.join(self.directory.name, name)
+                with open(path, encoding='utf-8') as file:
+                    data = json.load(file)
+                data['etag'] = None
+                with open(path, 'w', encoding='utf-8') as file:
+                    json.dump(data, file)
+            load_quietly(make_html_counter(server, cache=cache))
+            self.assertEqual(
+                server.server.not_modified, server.server.requests // 2
+            )
+
+    def test_no_validators(self):
+        cache = PageCache(self.directory.name)
+        with StubWikiServer(validators=False) as server:
+            load_quietly(make_html_counter(server, cache=cache))
+        self.assertEqual(cache.size(), 0)
+
+    def test_max_age(self):
+        cache = PageCache(self.directory.name, max_age=0)
+        with StubWikiServer() as server:
+            load_quietly(make_html_counter(server, cache=cache))
+            time.sleep(0.01)
+            load_quietly(make_html_counter(server, cache=cache))
+            self.assertEqual(server.server.not_modified, 0)
+
+    def test_touch_updates_mtime_only(self):
+        cache = PageCache(self.directory.name, max_age=60)
+        page = CategoryPage([('А', 1)], None)
+        cache.put('http://a', 'body', '"etag"', None, page)
+        path = cache._path('http://a')
+        with open(path, 'rb') as file:
+            contents = file.read()
+        old = time.time() - 120
+        os.utime(path, (old, old))
+        cache.touch('http://a')
+        with open(path, 'rb') as file:
+            self.assertEqual(file.read(), contents)
+        self.assertEqual(cache.get('http://a').page, page)
+        os.utime(path, (old, old))
+        self.assertIsNone(
+            cache.get('http://a'),
+            msg='Убедитесь, что возраст записи определяется по времени файла'
+        )
+
+    def test_max_bytes(self):
+        max_bytes = 5000
+        cache = PageCache(self.directory.name, max_bytes=max_bytes)
+        with StubWikiServer() as server:
+            load_quietly(make_html_counter(server, cache=cache))
+        self.assertGreater(cache.size(), 0)
+        self.assertLessEqual(
+            cache.size(),
+            max_bytes,
+            msg='Убедитесь, что размер кэша не превышает ограничения'
+        )
+
+    def test_corrupted_entry(self):
+        cache = PageCache(self.directory.name)
+        with StubWikiServer() as server:
+            load_quietly(make_html_counter(server, cache=cache))
+            for name in os.listdir(self.directory.name):
+                with open(os.path.join(self.directory.name, name), 'w') as f:
+                    f.write('{')
+            counter = load_quietly(make_html_counter(server, cache=cache))
+            self.assertEqual(server.server.not_modified, 0)
+        self.assertEqual(dict(counter.items()), expected_counts())
+
+
+class TestCheckpoint(unittest.TestCase):
+    """ Тесты контрольных точек и продолжения обхода. """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'checkpoint.json')
+
+    def make_counter(self, server, **kwargs):
+        return make_html_counter(
+            server, checkpoint_path=self.path, retries=0, **kwargs
+        )
+
+    def test_resume_after_failure(self):
+        with StubWikiServer() as server:
+            server.server.fail_after = 4
+            counter = self.make_counter(server)
+            with self.assertRaises(SystemExit):
+                load_quietly(counter)
+            self.assertTrue(os.path.exists(self.path))
+            with open(self.path, encoding='utf-8') as file:
+                self.assertEqual(json.load(file)['pages'], 4)
+
+            server.server.fail_after = None
+            server.server.requests = 0
+            with contextlib.redirect_stdout(io.StringIO()):
+                counter.load(resume=True)
+            resumed_requests = server.server.requests
+            full_requests = len(TITLES) // HTML_PAGE_SIZE
+        self.assertEqual(
+            dict(counter.items()),
+            expected_counts(),
+            msg=(
+                'Убедитесь, что продолжение обхода с контрольной точки '
+                'не теряет и не дублирует страницы'
+            )
+        )
+        self.assertEqual(resumed_requests, full_requests - 4)
+        self.assertFalse(
+            os.path.exists(self.path),
+            msg='Убедитесь, что контрольная точка удаляется после обхода'
+        )
+
+    def test_resume_in_new_counter(self):
+        with StubWikiServer() as server:
+            server.server.fail_after = 3
+            with self.assertRaises(SystemExit):
+                load_quietly(self.make_counter(server, checkpoint_every=2))
+            with open(self.path, encoding='utf-8') as file:
+                self.assertEqual(json.load(file)['pages'], 3)
+            server.server.fail_after = None
+            counter = self.make_counter(server)
+            with contextlib.redirect_stdout(io.StringIO()):
+                counter.load(resume=True)
+        self.assertEqual(dict(counter.items()), expected_counts())
+
+    def test_resume_without_checkpoint(self):
+        with StubWikiServer() as server:
+            counter = self.make_counter(server)
+            with contextlib.redirect_stdout(io.StringIO()):
+                counter.load(resume=True)
+        self.assertEqual(dict(counter.items()), expected_counts())
+
+    def test_checkpoint_of_other_category(self):
+        with StubWikiServer() as server:
+            server.server.fail_after = 2
+            with self.assertRaises(SystemExit):
+                load_quietly(self.make_counter(server))
+            with open(self.path, encoding='utf-8') as file:
+                data = json.load(file)
+            data['base_url'] = server.url + '/wiki/Категория:Растения'
+            with open(self.path, 'w', encoding='utf-8') as file:
+                json.dump(data, file)
+
+            server.server.fail_after = None
+            server.server.requests = 0
+            counter = self.make_counter(server)
+            with contextlib.redirect_stdout(io.StringIO()):
+                counter.load(resume=True)
+            self.assertEqual(
+                server.server.requests, len(TITLES) // HTML_PAGE_SIZE
+            )
+        self.assertEqual(dict(counter.items()), expected_counts())
+
+    def test_resume_requires_path(self):
+        with StubWikiServer() as server, self.assertRaises(ValueError):
+            make_html_counter(server).load(resume=True)
+
+
+class SlowParseMixin:
+    """ Имитирует разбор страницы, сравнимый по времени с загрузкой. """
+    PARSE_DELAY = 0.05
+
+    def _parse_page(self, contents):
+        time.sleep(self.PARSE_DELAY)
+        return super()._parse_page(contents)
+
+
+class WrongScanMixin:
+    """ Быстрый поиск ссылки всегда находит неверную страницу. """
+
+    def _scan_next_page_url(self, fetched):
+        return self.BASE_URL + '?page=0'
+
+
+class TestPipeline(unittest.TestCase):
+    """ Тесты конвейерной загрузки и разбора страниц. """
+
+    def load_timed(self, counter):
+        started = time.monotonic()
+        load_quietly(counter)
+        return time.monotonic() - started
+
+    def test_same_counter(self):
+        with StubWikiServer() as server:
+            for prefetch in (1, 3):
+                with self.subTest(prefetch=prefetch):
+                    counter = make_html_counter(server, prefetch=prefetch)
+                    self.assertEqual(
+                        dict(load_quietly(counter).items()),
+                        expected_counts()
+                    )
+
+    def test_overlaps_fetch_and_parse(self):
+        counter_class = type(
+            'SlowParseCounter', (SlowParseMixin, WikiAnimalNameCounter), {}
+        )
+        with StubWikiServer(delay=0.05) as server:
+            sequential = self.load_timed(
+                make_html_counter(server, counter_class)
+            )
+            counter = make_html_counter(server, counter_class, prefetch=1)
+            pipelined = self.load_timed(counter)
+        self.assertEqual(dict(counter.items()), expected_counts())
+        self.assertLess(
+            pipelined,
+            sequential * 0.8,
+            msg=(
+                'Убедитесь, что загрузка следующей страницы выполняется '
+                'во время разбора текущей'
+            )
+        )
+
+    def test_wrong_scan(self):
+        counter_class = type(
+            'WrongScanCounter', (WrongScanMixin, WikiAnimalNameCounter), {}
+        )
+        with StubWikiServer() as server:
+            counter = make_html_counter(server, counter_class, prefetch=2)
+            self.assertEqual(
+                dict(load_quietly(counter).items()), expected_counts()
+            )
+
+    def test_with_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = PageCache(directory)
+            with StubWikiServer() as server:
+                load_quietly(make_html_counter(server, cache=cache))
+                counter = make_html_counter(server, cache=cache, prefetch=1)
+                self.assertEqual(
+                    dict(load_quietly(counter).items()), expected_counts()
+                )
+                self.assertGreater(server.server.not_modified, 0)
+
+    def test_resume_after_failure(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'checkpoint.json')
+            with StubWikiServer() as server:
+                server.server.fail_after = 4
+                counter = make_html_counter(
+                    server, checkpoint_path=path, retries=0, prefetch=2
+                )
+                with self.assertRaises(SystemExit):
+                    load_quietly(counter)
+                server.server.fail_after = None
+                with contextlib.redirect_stdout(io.StringIO()):
+                    counter.load(resume=True)
+        self.assertEqual(dict(counter.items()), expected_counts())
+
+
+class TestWikiApiAnimalNameCounter(unittest.TestCase):
+    """ Тесты параллельного обхода букв через MediaWiki API. """
+
+    def test_same_counter_as_html(self):
+        with StubWikiServer() as server:
+            html_counter = load_quietly(make_html_counter(server))
+            api_counter = load_quietly(make_api_counter(server))
+        self.assertEqual(
+            dict(api_counter.items()),
+            dict(html_counter.items()),
+            msg=(
+                'Убедитесь, что обход через API возвращает тот же '
+                '`Счетчик`, что и обход HTML страниц'
+            )
+        )
+        self.assertEqual(api_counter.total, sum(expected_counts().values()))
+
+    def test_letter_ranges(self):
+        """ Диапазоны `Ё` и `Я` в сортировке `uppercase` не пусты. """
+        ranges = WikiApiAnimalNameCounter._letter_ranges()
+        self.assertEqual(ranges['Ё'], 'А')
+        self.assertEqual(ranges['Е'], 'Ж')
+        self.assertIsNone(ranges['Я'])
+        with StubWikiServer() as server:
+            api_counter = load_quietly(make_api_counter(server))
+        counts = dict(api_counter.items())
+        self.assertEqual(counts['Ё'], 1)
+        self.assertEqual(counts['Я'], 2)
+
+    def test_concurrency_limit(self):
+        with StubWikiServer(delay=0.02) as server:
+            load_quietly(make_api_counter(server, concurrency=3))
+            max_in_flight = server.server.max_in_flight
+        self.assertGreater(max_in_flight, 1)
+        self.assertLessEqual(
+            max_in_flight,
+            3,
+            msg=(
+                'Убедитесь, что количество одновременных запросов '
+                'не превышает заданного ограничения'
+            )
+        )
+
+    def test_invalid_concurrency(self):
+        with StubWikiServer() as server, self.assertRaises(ValueError):
+            make_api_counter(server, concurrency=0)
+
+    def test_api_error_exits(self):
+        with StubWikiServer() as server:
+            counter = make_api_counter(server, concurrency=1)
+            counter.CATEGORY_TITLE = 'Категория:Несуществующая'
+            with self.assertRaises(SystemExit) as exit_info:
+                load_quietly(counter)
+        self.assertEqual(
+            exit_info.exception.code, counter.CONNECTION_ERROR_MESSAGE
+        )
+
+    def test_html_options_unsupported(self):
+        with StubWikiServer() as server:
+            for options in ({'prefetch': 2}, {'parser': 'soup'}):
+                with self.subTest(**options):
+                    with self.assertRaises(ValueError):
+                        make_api_counter(server, **options)
+
+    def test_checkpoints_unsupported(self):
+        with StubWikiServer() as server:
+            with self.assertRaises(ValueError):
+                make_api_counter(server, checkpoint_path='checkpoint.json')
+            with self.assertRaises(ValueError):
+                make_api_counter(server).load(resume=True)
+
+
+class TestHttpSession(unittest.TestCase):
+    """ Тесты HTTP сессии `Счетчика`. """
+
+    def test_keep_alive_and_compression(self):
+        with StubWikiServer() as server:
+            load_quietly(make_html_counter(server))
+            stub = server.server
+        self.assertGreater(stub.requests, 1)
+        self.assertEqual(
+            len(stub.connections),
+            1,
+            msg='Убедитесь, что страницы загружаются через одно соединение'
+        )
+        self.assertEqual(stub.compressed, stub.requests)
+
+    def test_retry_after(self):
+        with StubWikiServer(failures=1, retry_after=1) as server:
+            started = time.monotonic()
+            counter = load_quietly(make_html_counter(server))
+            elapsed = time.monotonic() - started
+        self.assertEqual(dict(counter.items()), expected_counts())
+        self.assertGreaterEqual(
+            elapsed,
+            1,
+            msg='Убедитесь, что повтор учитывает заголовок `Retry-After`'
+        )
+
+    def test_retries_exhausted(self):
+        with StubWikiServer(failures=10) as server:
+            counter = make_html_counter(
+                server, retries=2, backoff_factor=0, backoff_jitter=0
+            )
+            with self.assertRaises(SystemExit):
+                load_quietly(counter)
+            self.assertEqual(server.server.requests, 3)
+
+    def test_backoff_jitter(self):
+        history = (RequestHistory('GET', '/', None, 503, None),) * 3
+        retry = JitterRetry(
+            total=5, backoff_factor=1, backoff_jitter=0.5
+        ).new(history=history)
+        self.assertEqual(retry.backoff_jitter, 0.5)
+        for _ in range(100):
+            self.assertTrue(4 <= retry.get_backoff_time() <= 4.5)
+
+    def test_make_retry_jitter(self):
+        """ Добавка не удваивается при любой версии urllib3. """
+        history = (RequestHistory('GET', '/', None, 503, None),) * 3
+        retry = make_retry(5, 1, 0.5).new(history=history)
+        for _ in range(100):
+            self.assertTrue(4 <= retry.get_backoff_time() <= 4.5)
+
+
+class TestDumpAnimalNameCounter(unittest.TestCase):
+    """ Тесты подсчета по локальным дампам Википедии. """
+    FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+    DUMPS = ('categorylinks.sql', 'pages-articles.xml')
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def compressed_dumps(self):
+        """ Пути к дампам без сжатия, в архивах gzip и bzip2. """
+        for name in self.DUMPS:
+            path = os.path.join(self.FIXTURES, name)
+            yield path
+            for suffix, opener in (('.gz', gzip.open), ('.bz2', bz2.open)):
+                compressed_path = os.path.join(self.directory, name + suffix)
+                with open(path, 'rb') as source:
+                    with opener(compressed_path, 'wb') as target:
+                        shutil.copyfileobj(source, target)
+                yield compressed_path
+
+    def test_checkpoints_unsupported(self):
+        path = os.path.join(self.FIXTURES, self.DUMPS[0])
+        with self.assertRaises(ValueError):
+            DumpAnimalNameCounter(path, checkpoint_path='checkpoint.json')
+        with self.assertRaises(ValueError):
+            DumpAnimalNameCounter(path).load(resume=True)
+
+    def test_counts_by_letter(self):
+        for path in self.compressed_dumps():
+            with self.subTest(dump=os.path.basename(path)):
+                counter = load_quietly(DumpAnimalNameCounter(path))
+                self.assertEqual(
+                    dict(counter.items()),
+                    expected_counts(),
+                    msg=(
+                        'Убедитесь, что `Счетчик` по дампу учитывает только '
+                        'страницы категории `Животные по алфавиту`'
+                    )
+                )
+
+    def test_same_counter_as_html(self):
+        with StubWikiServer() as server:
+            html_counter = load_quietly(make_html_counter(server))
+        for name in self.DUMPS:
+            dump_counter = load_quietly(
+                DumpAnimalNameCounter(os.path.join(self.FIXTURES, name))
+            )
+            self.assertEqual(
+                dict(dump_counter.items()), dict(html_counter.items())
+            )
+
+    def test_parse_values(self):
+        self.assertEqual(
+            parse_values("7,'Ли\\'са (рыжая, \\\\)',NULL,'а\\nб'"),
+            ['7', "Ли'са (рыжая, \\)", None, 'а\nб']
+        )
+
+    def test_columns_from_create_table(self):
+        path = os.path.join(self.FIXTURES, 'categorylinks.sql')
+        with open(path, encoding='utf-8') as lines:
+            row = next(iter_sql_rows(lines, 'categorylinks'))
+        self.assertEqual(row['cl_sortkey_prefix'], '')
+        self.assertEqual(row['cl_timestamp'], '2020-01-01 00:00:00')
+        self.assertEqual(row['cl_type'], 'page')
+
+    def test_bounded_memory(self):
+        path = os.path.join(self.directory, 'categorylinks.sql.gz')
+        rows_per_insert, inserts = 1000, 50
+        with gzip.open(path, 'wt', encoding='utf-8') as dump:
+            for insert in range(inserts):
+                rows = ','.join(
+                    f"({insert * rows_per_insert + row},"
+                    "'Животные_по_алфавиту','ЖИРАФ','2020-01-01 00:00:00',"
+                    "'','uppercase','page')"
+                    for row in range(rows_per_insert)
+                )
+                dump.write(f'INSERT INTO `categorylinks` VALUES {rows};\n')
+        tracemalloc.start()
+        counter = load_quietly(DumpAnimalNameCounter(path))
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertEqual(
+            dict(counter.items()), {'Ж': rows_per_insert * inserts}
+        )
+        self.assertLess(
+            peak_memory,
+            2 * 1024 * 1024,
+            msg='Убедитесь, что дамп читается потоково'
+        )
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            DumpAnimalNameCounter('categorylinks.csv.gz')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,8 @@
 
 Общий поток выполенения:
 1. Получить тектсовое содержание страницы с помощью `requests`.
-2. С помощью `beautifulsoup` получить HTML элементы:
+2. С помощью `lxml` или `beautifulsoup` (см. `page_parser`)
+   получить HTML элементы:
   - буква алфавита (<h3>);
   - список ссылок на страницы животных под буквой (<li>);
   - ссылку на следующую страницу (<a>).
@@ -16,8 +17,28 @@
 import sys
 import requests
 from collections import Counter
+from contextlib import nullcontext
 from pprint import pprint
-from bs4 import BeautifulSoup
+from typing import NamedTuple, Optional
+
+from checkpoint import load_checkpoint, remove_checkpoint, save_checkpoint
+from http_session import (
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_BACKOFF_JITTER,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_RETRIES,
+    DEFAULT_TIMEOUT,
+    make_session
+)
+from page_cache import PageCache
+from page_parser import (
+    CATEGORY_TITLE,
+    DEFAULT_PARSER,
+    PARSERS,
+    CategoryPage,
+    find_next_href
+)
+from pipeline import PagePrefetcher
 
 
 class CounterLoadedException(Exception):
@@ -30,6 +51,17 @@ class CounterLoadedException(Exception):
         super().__init__(self.message)
 
 
+class FetchedPage(NamedTuple):
+    """
+    Загруженная страница категории: текст страницы либо,
+    при ответе `304 Not Modified`, сохраненный в кэше результат разбора.
+    """
+    url: str
+    response: requests.Response
+    contents: Optional[str]
+    page: Optional[CategoryPage]
+
+
 class BaseWikiAnimalNameCounter:
     """
     Базовый класс. Содержит основной функционал
@@ -50,11 +82,72 @@ class BaseWikiAnimalNameCounter:
         'Класс {} нельзя использовать напрямую. '
         'Создайте дочерний класс и реализуйте необходимые методы.'
     )
+    SUPPORTS_CHECKPOINTS = True
+    CHECKPOINTS_UNSUPPORTED_MESSAGE = (
+        '{} не поддерживает контрольные точки обхода'
+    )
     WIKI_DOMAIN = 'https://ru.wikipedia.org'
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        session: requests.Session = None,
+        timeout=DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        backoff_jitter: float = DEFAULT_BACKOFF_JITTER,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        parser: str = DEFAULT_PARSER,
+        cache: PageCache = None,
+        checkpoint_path: str = None,
+        checkpoint_every: int = 1,
+        prefetch: int = 0
+            ) -> None:
+        """
+        `session` - готовая HTTP сессия; если не передана, создается
+        сессия с пулом соединений и повтором запросов (см. `make_session`).
+        `timeout` - время ожидания соединения и ответа в секундах
+        (число или кортеж).
+        `parser` - реализация разбора страниц (см. `page_parser.PARSERS`).
+        `cache` - дисковый кэш страниц для условных запросов
+        (см. `page_cache.PageCache`).
+        `checkpoint_path` - файл контрольной точки обхода, которая
+        сохраняется каждые `checkpoint_every` страниц и при ошибке
+        загрузки страницы (см. `load(resume=True)`).
+        `prefetch` - количество страниц, загружаемых заранее
+        в фоновом потоке во время разбора текущей страницы;
+        0 - страницы загружаются и разбираются по очереди.
+        """
+        if parser not in PARSERS:
+            raise ValueError(
+                f'Неизвестная реализация разбора: {parser}. '
+                f'Доступные: {", ".join(PARSERS)}'
+            )
+        if checkpoint_every < 1:
+            raise ValueError(
+                'Интервал контрольных точек должен быть положительным'
+            )
+        if prefetch < 0:
+            raise ValueError(
+                'Количество загружаемых заранее страниц '
+                'не может быть отрицательным'
+            )
+        if checkpoint_path is not None and not self.SUPPORTS_CHECKPOINTS:
+            raise ValueError(
+                self.CHECKPOINTS_UNSUPPORTED_MESSAGE.format(
+                    self.__class__.__name__
+                )
+            )
         self._counter = Counter()
+        self.parser = parser
+        self.cache = cache
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.prefetch = prefetch
         self.loaded = False
+        self.timeout = timeout
+        self._session = session or make_session(
+            retries, backoff_factor, backoff_jitter, pool_size
+        )
 
     def load(self):
         raise NotImplementedError(
@@ -101,55 +194,148 @@ class BaseWikiAnimalNameCounter:
             self.IMPROPER_USE_MESSAGE.format(self.__class__.__name__)
         )
 
-    def _count_letters(self):
+    def _count_letters(self, current_letter=None, current_url=None, pages=0):
         """
         Подсчитывает количество названий животных
         с группировкой по буквам русского алфавита.
+        Обход начинается с `current_url` (по умолчанию - с первой
+        страницы категории), `pages` - количество уже обработанных
+        страниц при продолжении обхода с контрольной точки.
+        При `prefetch` следующие страницы загружаются в фоновом
+        потоке во время разбора текущей (см. `pipeline`).
         """
-        current_letter = self.FIRST_LETTER
-        current_url = self.BASE_URL
+        current_letter = current_letter or self.FIRST_LETTER
+        current_url = current_url or self.BASE_URL
+
+        if self.prefetch:
+            prefetcher = PagePrefetcher(
+                self._fetch_page, self._scan_next_page_url, self.prefetch
+            )
+            fetch_page = prefetcher.get
+        else:
+            prefetcher = nullcontext()
+            fetch_page = self._fetch_page
 
         print(f'Обрабатываю животных на букву {current_letter}')
-        while not current_letter.isascii():
-            contents = self._get_page_contents(current_url)
-            soup = BeautifulSoup(contents, 'lxml')
-            animal_list = soup.find('div', 'mw-category-columns').contents
-            for animal in animal_list:
-                first_animal_letter = animal.find('h3').text.upper()
-
-                #  Случай, когда на одной странице встречаются категории
-                #  животных на русском и английском языках.
-                if first_animal_letter.isascii():
-                    break
-
-                if first_animal_letter != current_letter:
-                    print(
-                        f'Обрабатываю животных на букву {first_animal_letter}'
-                    )
-                list_elements = animal.find_all('li')
-                self._counter[first_animal_letter] += len(list_elements)
-            current_letter = first_animal_letter
-            current_url = self._get_next_page_url(soup)
+        with prefetcher:
+            while not current_letter.isascii():
+                try:
+                    fetched = fetch_page(current_url)
+                except SystemExit:
+                    self._save_checkpoint(current_letter, current_url, pages)
+                    raise
+                page = self._read_page(fetched)
+                for first_animal_letter, count in page.groups:
+                    first_animal_letter = first_animal_letter.upper()
+
+                    #  Случай, когда на одной странице встречаются категории
+                    #  животных на русском и английском языках.
+                    if first_animal_letter.isascii():
+                        break
+
+                    if first_animal_letter != current_letter:
+                        print(
+                            'Обрабатываю животных на букву '
+                            f'{first_animal_letter}'
+                        )
+                    self._counter[first_animal_letter] += count
+                current_letter = first_animal_letter
+                current_url = self._get_next_page_url(page)
+                pages += 1
+                if pages % self.checkpoint_every == 0:
+                    self._save_checkpoint(current_letter, current_url, pages)
+
+        if self.checkpoint_path is not None:
+            remove_checkpoint(self.checkpoint_path)
+
+    def _save_checkpoint(self, letter, url, pages):
+        """
+        Сохраняет контрольную точку: счетчик содержит результаты
+        всех страниц до `url`.
+        """
+        if self.checkpoint_path is not None:
+            save_checkpoint(
+                self.checkpoint_path,
+                self.BASE_URL,
+                self._counter,
+                letter,
+                url,
+                pages
+            )
+
+    def _parse_page(self, contents):
+        """
+        Разбирает страницу категории выбранной реализацией разбора.
+        Возвращает `CategoryPage`.
+        """
+        return PARSERS[self.parser](contents, CATEGORY_TITLE)
 
-    def _get_page_contents(self, url):
-        """ Возвращает текстовое содержание web-страницы. """
+    def _fetch_page(self, url):
+        """
+        Загружает страницу категории. При подключенном кэше
+        отправляет условный запрос и на ответ `304 Not Modified`
+        возвращает сохраненный результат разбора.
+        """
+        if self.cache is None:
+            response = self._get_response(url)
+            return FetchedPage(url, response, response.text, None)
+
+        entry = self.cache.get(url)
+        response = self._get_response(
+            url, entry.validators() if entry is not None else None
+        )
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url)
+            return FetchedPage(url, response, None, entry.page)
+        return FetchedPage(url, response, response.text, None)
+
+    def _read_page(self, fetched):
+        """
+        Результат разбора загруженной страницы. Новые результаты
+        сохраняются в кэш, если он подключен.
+        """
+        if fetched.page is not None:
+            return fetched.page
+
+        page = self._parse_page(fetched.contents)
+        if self.cache is not None and fetched.response.status_code == 200:
+            self.cache.put(
+                fetched.url,
+                fetched.contents,
+                fetched.response.headers.get('ETag'),
+                fetched.response.headers.get('Last-Modified'),
+                page
+            )
+        return page
+
+    def _scan_next_page_url(self, fetched):
+        """
+        Ссылка на следующую страницу, найденная без разбора
+        загруженной страницы, или None.
+        """
+        if fetched.page is not None:
+            next_href = fetched.page.next_href
+        else:
+            next_href = find_next_href(fetched.contents, CATEGORY_TITLE)
+        return self.WIKI_DOMAIN + next_href if next_href else None
+
+    def _get_response(self, url, headers=None):
+        """ Выполняет GET запрос и возвращает ответ. """
         try:
-            contents = requests.get(url).text
-        except requests.exceptions.ConnectionError:
+            return self._session.get(
+                url, headers=headers, timeout=self.timeout
+            )
+        except requests.exceptions.RequestException:
             sys.exit(self.CONNECTION_ERROR_MESSAGE)
-        return contents
-
-    def _get_next_page_url(self, soup):
-        """ Находит и возвращает ссылку на следующую страницу. """
-        prev_next_pages = soup.find(
-            'div', attrs={'id': 'mw-pages'}
-        ).find_all(
-            'a', attrs={'title': 'Категория:Животные по алфавиту'}
-        )
-        for page in prev_next_pages:
-            if page.text == 'Следующая страница':
-                end_point = page.get('href')
-                return self.WIKI_DOMAIN + end_point
+
+    def _get_page_contents(self, url):
+        """ Возвращает текстовое содержание web-страницы. """
+        return self._get_response(url).text
+
+    def _get_next_page_url(self, page):
+        """ Возвращает ссылку на следующую страницу. """
+        if page.next_href is not None:
+            return self.WIKI_DOMAIN + page.next_href
         sys.exit(
             'Структура страницы сайта была изменена! Обратитесь к разработчику'
         )
@@ -158,16 +344,45 @@ class BaseWikiAnimalNameCounter:
 class WikiAnimalNameCounter(BaseWikiAnimalNameCounter):
     """ Класс `Счетчика`, реализующий основной интерфейс. """
 
-    def load(self):
-        """ Запустить счетчик. Повторный запуск не допусается. """
+    def load(self, resume=False):
+        """
+        Запустить счетчик. Повторный запуск не допусается.
+        При `resume=True` обход продолжается с контрольной точки
+        `checkpoint_path`, если она есть, иначе начинается сначала.
+        """
         if self.loaded:
             raise CounterLoadedException()
-        self._count_letters()
+        state = None
+        if resume:
+            if not self.SUPPORTS_CHECKPOINTS:
+                raise ValueError(
+                    self.CHECKPOINTS_UNSUPPORTED_MESSAGE.format(
+                        self.__class__.__name__
+                    )
+                )
+            if self.checkpoint_path is None:
+                raise ValueError(
+                    'Для продолжения обхода укажите `checkpoint_path`'
+                )
+            state = load_checkpoint(self.checkpoint_path, self.BASE_URL)
+
+        #  Данные прерванного запуска заменяются контрольной точкой.
+        self._clear()
+        if state is None:
+            self._count_letters()
+        else:
+            print(
+                'Продолжаю обход с контрольной точки '
+                f'(обработано страниц: {state["pages"]})'
+            )
+            self._counter.update(state['counter'])
+            self._count_letters(state['letter'], state['url'], state['pages'])
         self.loaded = True
 
     def reload(self):
         """ Повторный запуск Счетчика с предварительной очисткой данных. """
         self._clear()
+        self.loaded = False
         self.load()
 
     @property
@@ -0,0 +1,154 @@
+"""
+Счетчик названий животных, использующий MediaWiki API вместо
+последовательного обхода HTML страниц категории.
+
+Запрос `list=categorymembers` позволяет ограничить выборку
+диапазоном ключей сортировки (`cmstartsortkeyprefix` и
+`cmendsortkeyprefix`). Поэтому каждая буква алфавита обходится
+как независимый диапазон, а буквы обрабатываются параллельно
+на пуле потоков с ограничением количества одновременных запросов.
+
+Категория использует сортировку `uppercase` (по кодам символов
+в верхнем регистре), в которой `Ё` идет перед `А`. Поэтому конец
+диапазона - следующая буква алфавита в порядке этой сортировки,
+а у последней буквы (`Я`) конца нет. Между буквами алфавита
+в этом порядке могут оказаться другие символы кириллицы, поэтому
+учитываются только страницы, ключ сортировки которых начинается
+с самой буквы, а обход диапазона останавливается на первой
+странице с другой первой буквой.
+
+Результат - тот же `Counter` по буквам, что и у `WikiAnimalNameCounter`.
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import requests
+
+from wiki_animal_counter import WikiAnimalNameCounter
+
+
+class WikiApiAnimalNameCounter(WikiAnimalNameCounter):
+    """ `Счетчик`, получающий списки животных по буквам через API. """
+    ALPHABET = 'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ'
+    API_URL = 'https://ru.wikipedia.org/w/api.php'
+    CATEGORY_TITLE = 'Категория:Животные по алфавиту'
+    DEFAULT_CONCURRENCY = 8
+    #  Параметры обхода HTML страниц, неприменимые к запросам API.
+    UNSUPPORTED_OPTIONS = ('cache', 'checkpoint_every', 'parser', 'prefetch')
+    PAGE_LIMIT = 500
+    #  Буквы обходятся параллельно, поэтому единой позиции обхода
+    #  для контрольной точки нет.
+    SUPPORTS_CHECKPOINTS = False
+
+    @classmethod
+    def _letter_ranges(cls) -> Dict[str, Optional[str]]:
+        """
+        Конец диапазона ключей сортировки для каждой буквы:
+        следующая буква в порядке сортировки `uppercase`
+        или None для последней буквы.
+        """
+        letters = sorted(cls.ALPHABET)
+        return dict(zip(letters, letters[1:] + [None]))
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        **session_options
+            ) -> None:
+        """
+        `concurrency` - количество одновременных запросов.
+        `session_options` - параметры HTTP сессии `Счетчика`;
+        параметры обхода HTML страниц (`UNSUPPORTED_OPTIONS`)
+        и контрольные точки не поддерживаются.
+        """
+        if concurrency < 1:
+            raise ValueError('Количество потоков должно быть положительным')
+        unsupported = [
+            name for name in self.UNSUPPORTED_OPTIONS
+            if name in session_options
+        ]
+        if unsupported:
+            raise ValueError(
+                f'{self.__class__.__name__} не поддерживает параметры: '
+                f'{", ".join(unsupported)}'
+            )
+        session_options.setdefault('pool_size', concurrency)
+        super().__init__(**session_options)
+        self.concurrency = concurrency
+
+    def _count_letters(self):
+        """
+        Подсчитывает количество названий животных по буквам,
+        обходя диапазоны букв параллельно.
+        """
+        ranges = self._letter_ranges()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            letter_counts = executor.map(
+                self._count_letter,
+                self.ALPHABET,
+                [ranges[letter] for letter in self.ALPHABET]
+            )
+            for letter, count in zip(self.ALPHABET, letter_counts):
+                if count:
+                    self._counter[letter] += count
+
+    def _count_letter(self, letter, end_letter=None):
+        """
+        Количество страниц категории, ключ сортировки которых
+        начинается с буквы `letter`. Диапазон ограничен буквой
+        `end_letter` (None - без ограничения). Следует по `cmcontinue`,
+        пока API возвращает продолжение и страницы на букву `letter`.
+        """
+        print(f'Обрабатываю животных на букву {letter}')
+        params = {
+            'action': 'query',
+            'format': 'json',
+            'list': 'categorymembers',
+            'cmtitle': self.CATEGORY_TITLE,
+            'cmtype': 'page',
+            'cmprop': 'title|sortkeyprefix',
+            'cmlimit': self.PAGE_LIMIT,
+            'cmstartsortkeyprefix': letter,
+        }
+        if end_letter is not None:
+            params['cmendsortkeyprefix'] = end_letter
+        count = 0
+        while True:
+            response = self._get_api_response(params)
+            for member in response['query']['categorymembers']:
+                sortkey = member.get('sortkeyprefix') or member['title']
+                if sortkey[:1].upper() != letter:
+                    return count
+                count += 1
+            if 'continue' not in response:
+                return count
+            params.update(response['continue'])
+
+    def _get_api_response(self, params):
+        """
+        Возвращает разобранный JSON ответ API.
+        Ответ с ошибкой или без результата запроса
+        завершает работу, как и ошибка соединения.
+        """
+        try:
+            response = self._session.get(
+                self.API_URL, params=params, timeout=self.timeout
+            ).json()
+        except requests.exceptions.RequestException:
+            sys.exit(self.CONNECTION_ERROR_MESSAGE)
+        if (
+            not isinstance(response, dict)
+            or 'error' in response
+            or 'query' not in response
+        ):
+            sys.exit(self.CONNECTION_ERROR_MESSAGE)
+        return response
+
+
+if __name__ == '__main__':
+    counter = WikiApiAnimalNameCounter()
+    counter.load()
+    print('\n')
+    counter.print()